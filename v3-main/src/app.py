@@ -13,13 +13,15 @@ from typing import Any, Optional
 
 import redis.asyncio as redis
 import uvicorn
-from fastapi import Depends, FastAPI, HTTPException, Request, UploadFile, File, status
+from fastapi import Depends, FastAPI, HTTPException, Request, Response, UploadFile, File, status
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from langchain.schema import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -28,6 +30,8 @@ from src.agent import AgenticRAG
 from src.config import get_config, validate_api_keys_at_startup
 from src.embed import VoyageEmbedder
 from src.models import (
+    INGEST_REQUEST_ADAPTER,
+    QUERY_REQUEST_ADAPTER,
     ErrorResponse,
     HealthCheck,
     IngestRequest,
@@ -50,6 +54,33 @@ logger = logging.getLogger(__name__)
 config = get_config()
 security = HTTPBearer(auto_error=False)
 
+
+def _json_body(model: type[BaseModel]) -> dict[str, Any]:
+    """OpenAPI requestBody for routes that read and validate the raw body themselves."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
+
+
+async def _parse_body(request: Request, adapter: TypeAdapter) -> Any:
+    """
+    Validate a JSON request body with pydantic-core's parser directly.
+    
+    Skips FastAPI's json.loads -> dict -> model pipeline. Validation errors
+    surface as the usual 422 response.
+    """
+    try:
+        return adapter.validate_json(await request.body())
+    except ValidationError as e:
+        # Same error shape FastAPI produces for declared body parameters
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        )
+
+
 # Global state
 app_state = {
     "rag_agent": None,
@@ -343,6 +374,7 @@ app = FastAPI(
     description="Enterprise-grade RAG system for automotive dealerships",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if config.environment != "production" else None,
     redoc_url="/redoc" if config.environment != "production" else None,
 )
@@ -406,7 +438,7 @@ async def request_logging_middleware(request: Request, call_next):
             f"Processing time: {processing_time:.3f}s"
         )
         
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"detail": "Internal server error", "request_id": request_id},
             headers={"X-Request-ID": request_id},
@@ -505,9 +537,10 @@ async def metrics_endpoint():
     
     Returns metrics in Prometheus format for scraping by monitoring systems.
     """
-    from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+    from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
     
-    # Generate Prometheus metrics
+    # The default registry carries the OTel metrics through PrometheusMetricReader.
+    # With several workers, each scrape reports the worker that answered it.
     metrics_data = generate_latest()
     
     return Response(
@@ -516,11 +549,10 @@ async def metrics_endpoint():
     )
 
 
-@app.post("/query", response_model=QueryResponse)
+@app.post("/query", response_model=QueryResponse, openapi_extra=_json_body(QueryRequest))
 @limiter.limit(f"{config.rate_limit_per_minute}/minute")
 async def query_rag_system(
     request: Request,
-    query_request: QueryRequest,
     authenticated: bool = Depends(authenticate_request),
 ):
     """
@@ -530,6 +562,7 @@ async def query_rag_system(
     with source citations from the knowledge base and DMS integration.
     """
     start_time = time.time()
+    query_request: QueryRequest = await _parse_body(request, QUERY_REQUEST_ADAPTER)
     success = False
     
     # Create telemetry span for tracing
@@ -608,10 +641,9 @@ async def query_rag_system(
             )
 
 
-@app.post("/ingest", response_model=IngestResponse)
+@app.post("/ingest", response_model=IngestResponse, openapi_extra=_json_body(IngestRequest))
 async def ingest_documents(
     request: Request,
-    ingest_request: IngestRequest,
     authenticated: bool = Depends(authenticate_request),
 ):
     """
@@ -621,6 +653,7 @@ async def ingest_documents(
     by the RAG system.
     """
     start_time = time.time()
+    ingest_request: IngestRequest = await _parse_body(request, INGEST_REQUEST_ADAPTER)
     
     try:
         if not app_state["retriever"] or not app_state["embedder"]:
@@ -749,7 +782,7 @@ async def ingest_file(
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Custom HTTP exception handler with structured error responses."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail, "status_code": exc.status_code},
         headers=getattr(exc, 'headers', None),
@@ -761,7 +794,7 @@ async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions with proper logging."""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error occurred"},
     )
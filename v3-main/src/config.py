@@ -36,11 +36,32 @@ class Settings(BaseSettings):
         default="rerank-english-v3.0", description="Cohere model for re-ranking"
     )
     embedding_dimension: int = Field(default=1024, description="Dimension of the embedding vectors")
+    voyage_output_dtype: Literal["float", "int8"] = Field(
+        default="float",
+        description="Voyage embedding output dtype; int8 (voyage-3 models) cuts cache size 4x",
+    )
+    embed_concurrency: int = Field(
+        default=4, description="Maximum Voyage embed requests in flight per embed_batch call"
+    )
+    embedding_local_cache_size: int = Field(
+        default=10_000,
+        description=(
+            "In-process LRU entries kept in front of the Redis embedding cache; entries are "
+            "stored packed, about 4 KB each for 1024-dim float32 (~40 MB per worker at the default)"
+        ),
+    )
+    embedding_cache_quantize: bool = Field(
+        default=False,
+        description="Store float embeddings in Redis as scaled int8 (4x smaller, slightly lossy)",
+    )
 
     # Vector Database
     pinecone_api_key: str = Field(default="", description="Pinecone API key")
     pinecone_environment: str = Field(default="us-east-1-aws", description="Pinecone environment")
     pinecone_index_name: str = Field(default="dealership-rag", description="Pinecone index name")
+    pinecone_pool_threads: int = Field(
+        default=30, description="Concurrent Pinecone upsert batches (and upsert threads)"
+    )
 
     # DMS Integration
     cdk_api_key: str = Field(default="", description="CDK Global API key")
@@ -51,6 +72,13 @@ class Settings(BaseSettings):
     reynolds_api_key: str = Field(default="", description="Reynolds & Reynolds API key")
     reynolds_dealer_code: str = Field(default="", description="Reynolds dealer code")
     reynolds_mfa_token: str = Field(default="", description="Reynolds MFA token")
+    reynolds_signature_algorithm: Literal["sha256", "blake2b"] = Field(
+        default="sha256",
+        description=(
+            "HMAC digest for Reynolds request signatures; selects the local digest only, "
+            "the Reynolds side must be configured to verify with the same algorithm"
+        ),
+    )
     reynolds_api_url: str = Field(
         default="https://api.reyrey.com/v2", description="Reynolds API URL"
     )
@@ -73,6 +101,29 @@ class Settings(BaseSettings):
     elasticsearch_use_ssl: bool = Field(default=False, description="Use SSL for Elasticsearch")
     elasticsearch_verify_certs: bool = Field(default=True, description="Verify SSL certificates")
     elasticsearch_cloud_id: str = Field(default="", description="Elasticsearch Cloud ID")
+    elasticsearch_connections_per_node: int = Field(
+        default=50, description="HTTP connections kept per Elasticsearch node for concurrent searches"
+    )
+    elasticsearch_cache_size: int = Field(
+        default=2048, description="In-process LRU entries of keyword search results (0 disables)"
+    )
+    # The keyword cache is per process: indexing clears it only in the worker that ran the
+    # ingest, so other API workers can serve results that miss new documents for up to this TTL
+    elasticsearch_cache_ttl_seconds: float = Field(
+        default=60.0,
+        description="Seconds a cached keyword search result stays valid (bounds cross-worker staleness)",
+    )
+
+    # Event Streaming (Kafka)
+    kafka_compression_type: Literal["zstd", "snappy", "lz4", "gzip"] = Field(
+        default="zstd",
+        description="Kafka producer compression; use snappy for clusters older than Kafka 2.1",
+    )
+    kafka_linger_ms: int = Field(
+        default=50,
+        description="Max wait to fill a producer batch; full batches send immediately",
+    )
+    kafka_batch_size: int = Field(default=262144, description="Kafka producer batch size in bytes")
 
     # Celery Task Queue
     celery_broker_url: str = Field(
@@ -110,8 +161,14 @@ class Settings(BaseSettings):
     chunk_overlap: int = Field(default=200, description="Text chunk overlap")
     top_k_retrieval: int = Field(default=20, description="Top K documents to retrieve")
     top_k_rerank: int = Field(default=5, description="Top K documents after re-ranking")
+    rerank_cache_size: int = Field(
+        default=1024, description="In-process LRU entries of Cohere rerank orderings (0 disables)"
+    )
     max_tokens_generation: int = Field(default=1000, description="Max tokens for LLM generation")
     query_timeout_seconds: int = Field(default=30, description="Query timeout in seconds")
+    retrieval_timeout_seconds: float = Field(
+        default=10.0, description="Per-leg timeout for the concurrent vector and keyword searches"
+    )
 
     # Rate Limiting
     rate_limit_per_minute: int = Field(default=100, description="Rate limit per minute")
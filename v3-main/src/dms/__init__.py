@@ -3,7 +3,7 @@ DMS (Dealer Management System) adapters package.
 Provides standardized interface for integrating with various automotive DMS providers.
 """
 
-from .base import BaseDMSAdapter
+from .base import BaseDMSAdapter, DMSError
 from .cdk_adapter import CDKAdapter
 from .mock_adapter import MockDMSAdapter
 from .reynolds_adapter import ReynoldsAdapter
@@ -11,6 +11,7 @@ from .reynolds_adapter import ReynoldsAdapter
 __all__ = [
     "BaseDMSAdapter",
     "CDKAdapter", 
+    "DMSError",
     "MockDMSAdapter",
     "ReynoldsAdapter",
 ]
\ No newline at end of file
@@ -9,9 +9,17 @@ from typing import Any, Optional
 from src.models import Vehicle
 
 
+class DMSError(Exception):
+    """DMS request failures that callers should not mistake for an empty result."""
+    pass
+
+
 class BaseDMSAdapter(ABC):
     """Abstract base class for DMS adapters."""
 
+    # Lets subclasses opt into __slots__; those without it still get a __dict__
+    __slots__ = ()
+
     @abstractmethod
     async def get_inventory(
         self,
@@ -5,20 +5,217 @@ Implements secure authentication, MFA support, and comprehensive error handling.
 
 import asyncio
 import hashlib
+import hmac
 import logging
+import random
+import ssl
 import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import aiohttp
+import numpy as np
+import orjson
 from aiohttp import ClientSession, ClientTimeout
+from multidict import CIMultiDict
+from yarl import URL
 
 from src.config import get_config
-from src.models import Vehicle
-from .base import BaseDMSAdapter
+from src.models import Vehicle, VehicleBatch, VehicleCategory, VehicleStatus
+from .base import BaseDMSAdapter, DMSError
 
 logger = logging.getLogger(__name__)
 
+# Reynolds caps inventory pages at 200 vehicles
+INVENTORY_PAGE_SIZE = 200
+
+# Upper bound on how much of an error body is read into exception messages
+ERROR_SNIPPET_BYTES = 4096
+
+# HMAC digests the Reynolds signature scheme accepts. hashlib is OpenSSL-backed,
+# so sha256 already uses SHA-NI where the CPU has it; blake2b is faster without it.
+_SIGNATURE_DIGESTS = {
+    "sha256": hashlib.sha256,
+    "blake2b": hashlib.blake2b,
+}
+
+# Only reads are shared between concurrent identical calls
+_COALESCED_METHODS = frozenset({"GET"})
+
+# Single-flight keys serialize params/bodies: values may be lists or nested dicts
+_REQUEST_KEY_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+# VIN length and byte lookup table for the VIN alphabet (no I, O or Q)
+VIN_LENGTH = 17
+_VIN_ALLOWED = np.zeros(256, dtype=bool)
+_VIN_ALLOWED[list(b"ABCDEFGHJKLMNPRSTUVWXYZ0123456789")] = True
+
+# Record checks the columnar batch path applies up front, since its rows parse lazily
+_REQUIRED_VEHICLE_KEYS = ("vin", "make", "model", "model_year")
+_VEHICLE_STATUSES = frozenset(status.value for status in VehicleStatus)
+_VEHICLE_CATEGORIES = frozenset(category.value for category in VehicleCategory)
+
+# (Vehicle field, Reynolds field, default) extraction tables, built once at import
+_VEHICLE_FIELDS = (
+    ("trim", "trim_level", ""),
+    ("color", "exterior_color", ""),
+    ("mileage", "odometer", 0),
+    ("status", "status", "available"),
+    ("category", "type", "unknown"),
+    ("location", "lot_location", ""),
+)
+_VEHICLE_DETAIL_FIELDS = (
+    ("engine", "engine", ""),
+    ("transmission", "transmission", ""),
+    ("drivetrain", "drivetrain", ""),
+    ("fuel_type", "fuel_type", ""),
+    ("mpg_city", "mpg_city", 0),
+    ("mpg_highway", "mpg_highway", 0),
+    ("interior_color", "interior_color", ""),
+    ("body_style", "body_style", ""),
+    ("doors", "doors", 0),
+)
+_VEHICLE_DETAIL_PRICE_FIELDS = (
+    ("msrp", "msrp"),
+    ("invoice", "invoice"),
+    ("cost", "cost"),
+)
+_SERVICE_RECORD_FIELDS = (
+    ("mileage", "mileage_in", 0),
+    ("type", "service_type", "unknown"),
+    ("description", "customer_concern", ""),
+    ("work_performed", "work_performed", ""),
+    ("parts_used", "parts", None),
+    ("labor_hours", "total_labor_hours", 0),
+    ("technician", "technician_name", ""),
+    ("service_advisor", "service_advisor", ""),
+    ("warranty_work", "warranty_flag", False),
+    ("customer_pay", "customer_pay_flag", True),
+)
+_SERVICE_RECORD_COST_FIELDS = (
+    ("parts_cost", "parts_total"),
+    ("labor_cost", "labor_total"),
+    ("total_cost", "total_amount"),
+)
+
+
+def validate_vins(vins: List[str]) -> np.ndarray:
+    """
+    Validate many VINs at once.
+    
+    Checks length and character set with a single table lookup over a
+    (n, 17) byte matrix instead of a Python loop per character. Used on whole
+    inventory pages; single lookups keep the plain length check.
+    
+    Args:
+        vins: VIN strings to validate
+        
+    Returns:
+        Boolean mask, True where the VIN is well-formed
+    """
+    mask = np.zeros(len(vins), dtype=bool)
+    candidates = [i for i, vin in enumerate(vins) if vin and len(vin) == VIN_LENGTH]
+    if not candidates:
+        return mask
+    
+    # Non-ASCII characters become "?" (one byte each), which the table rejects
+    raw = b"".join(vins[i].encode("ascii", errors="replace") for i in candidates)
+    matrix = np.frombuffer(raw, dtype=np.uint8).reshape(-1, VIN_LENGTH)
+    mask[candidates] = _VIN_ALLOWED[matrix].all(axis=1)
+    return mask
+
+
+def _record_vin_mask(items: List[Dict[str, Any]]) -> np.ndarray:
+    """validate_vins over raw inventory records; case alone doesn't make a VIN invalid."""
+    vins = [item.get("vin") for item in items]
+    return validate_vins([vin.upper() if isinstance(vin, str) else "" for vin in vins])
+
+
+async def _error_snippet(response: aiohttp.ClientResponse) -> str:
+    """Read at most ERROR_SNIPPET_BYTES of an error body and release the connection."""
+    chunk = await response.content.read(ERROR_SNIPPET_BYTES)
+    response.release()
+    return chunk.decode("utf-8", errors="replace")
+
+
+@lru_cache(maxsize=256)
+def _build_url(base_url: str, endpoint: str) -> URL:
+    """Parse an endpoint URL once; aiohttp would otherwise re-parse the string per request."""
+    return URL(f"{base_url}{endpoint}")
+
+
+@lru_cache(maxsize=1024)
+def _parse_timestamp(value: str) -> datetime:
+    """Parse an ISO timestamp; records in one response often share values."""
+    return datetime.fromisoformat(value)
+
+
+def _parse_vehicle(
+    item: Dict[str, Any],
+    dealer_code: str,
+    now: datetime,
+    detailed: bool = False,
+    vin_valid: bool = True,
+) -> Vehicle:
+    """Build a Vehicle from a Reynolds inventory record using the field tables."""
+    get = item.get
+    last_modified = get("last_modified")
+    fields = {name: get(key, default) for name, key, default in _VEHICLE_FIELDS}
+    fields["price"] = float(get("asking_price", 0))
+    fields["features"] = get("options") or []
+    fields["images"] = get("images") or []
+    
+    if detailed:
+        for name, key, default in _VEHICLE_DETAIL_FIELDS:
+            fields[name] = get(key, default)
+        for name, key in _VEHICLE_DETAIL_PRICE_FIELDS:
+            fields[name] = float(get(key, 0))
+    
+    return Vehicle(
+        vin=item["vin"],
+        make=item["make"],
+        model=item["model"],
+        year=int(item["model_year"]),
+        dealer_id=dealer_code,
+        last_updated=_parse_timestamp(last_modified) if last_modified else now,
+        vin_valid=vin_valid,
+        **fields,
+    )
+
+
+def _vehicle_record_error(item: Dict[str, Any]) -> Optional[str]:
+    """Why a raw inventory record cannot become a Vehicle, or None if it can."""
+    missing = [key for key in _REQUIRED_VEHICLE_KEYS if item.get(key) is None]
+    if missing:
+        return f"missing {'/'.join(missing)}"
+    status = item.get("status", "available")
+    if not isinstance(status, str) or status not in _VEHICLE_STATUSES:
+        return f"invalid status {status!r}"
+    category = item.get("type", "unknown")
+    if not isinstance(category, str) or category not in _VEHICLE_CATEGORIES:
+        return f"invalid type {category!r}"
+    return None
+
+
+def _parse_service_record(record: Dict[str, Any], vin: str, dealer_code: str) -> Dict[str, Any]:
+    """Map a Reynolds repair order onto the standard service record shape."""
+    get = record.get
+    service_record = {
+        "service_id": record["repair_order_number"],
+        "vin": vin,
+        "date": record["service_date"],
+    }
+    for name, key, default in _SERVICE_RECORD_FIELDS:
+        service_record[name] = get(key, default)
+    if service_record["parts_used"] is None:
+        service_record["parts_used"] = []
+    for name, key in _SERVICE_RECORD_COST_FIELDS:
+        service_record[name] = float(get(key, 0))
+    service_record["dealer_id"] = dealer_code
+    return service_record
+
 
 class ReynoldsAuthenticationError(Exception):
     """Reynolds authentication-specific errors."""
@@ -37,27 +234,79 @@ class ReynoldsAdapter(BaseDMSAdapter):
     Implements API key authentication with MFA support, rate limiting, and comprehensive error handling.
     """
 
+    # Fixed attribute layout: hot-path attribute reads skip the instance __dict__
+    __slots__ = (
+        "config",
+        "base_url",
+        "api_key",
+        "dealer_code",
+        "mfa_token",
+        "signature_algorithm",
+        "session_token",
+        "session_expires_at",
+        "rate_limit",
+        "rate_window",
+        "request_timestamps",
+        "session",
+        "total_requests",
+        "failed_requests",
+        "auth_failures",
+        "rate_limit_hits",
+        "_auth_url",
+        "_hmac_template",
+        "_dealer_code_bytes",
+        "_dealer_header",
+        "_content_type_header",
+        "_session_expires_monotonic",
+        "_auth_lock",
+        "_auth_version",
+        "_rate_limit_lock",
+        "_inflight",
+    )
+
+    # Shared across instances - building an SSL context loads the CA bundle
+    _ssl_context: Optional[ssl.SSLContext] = None
+
     def __init__(self):
         self.config = get_config()
         self.base_url = "https://api.reyrey.com/v2"
+        self._auth_url = _build_url(self.base_url, "/auth/session")
         
         # Authentication credentials
         self.api_key = self.config.reynolds_api_key
         self.dealer_code = self.config.reynolds_dealer_code
         self.mfa_token = self.config.reynolds_mfa_token  # For MFA if required
         
+        # Pre-keyed HMAC state, copied per signature (built in initialize)
+        self.signature_algorithm = self.config.reynolds_signature_algorithm
+        self._hmac_template: Optional[hmac.HMAC] = None
+        self._dealer_code_bytes = self.dealer_code.encode('utf-8')
+        
+        # Static header items; only timestamp/signature/token vary per request
+        self._dealer_header = ("X-Reynolds-Dealer-Code", self.dealer_code)
+        self._content_type_header = ("Content-Type", "application/json")
+        
         # Session management
         self.session_token: Optional[str] = None
-        self.session_expires_at: Optional[datetime] = None
+        self.session_expires_at: Optional[datetime] = None  # Wall clock, for stats/logging
+        self._session_expires_monotonic: Optional[float] = None  # Used for expiry checks
+        
+        # Single-flight re-authentication: bumped on every successful auth
+        self._auth_lock = asyncio.Lock()
+        self._auth_version = 0
         
         # Rate limiting (Reynolds allows 500 requests per 5 minutes)
         self.rate_limit = 500
         self.rate_window = 300  # 5 minutes
-        self.request_timestamps: List[float] = []
+        self.request_timestamps: deque[float] = deque(maxlen=self.rate_limit)
+        self._rate_limit_lock = asyncio.Lock()
         
         # HTTP session
         self.session: Optional[ClientSession] = None
         
+        # In-flight GET requests keyed by (method, endpoint, params, json_data)
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        
         # Performance tracking
         self.total_requests = 0
         self.failed_requests = 0
@@ -71,9 +320,29 @@ class ReynoldsAdapter(BaseDMSAdapter):
                 "Reynolds credentials not configured - check REYNOLDS_API_KEY and REYNOLDS_DEALER_CODE environment variables"
             )
         
+        # Key the HMAC once so the ipad/opad blocks aren't recomputed per signature
+        self._hmac_template = hmac.new(
+            self.api_key.encode('utf-8'),
+            digestmod=_SIGNATURE_DIGESTS[self.signature_algorithm],
+        )
+        
+        if ReynoldsAdapter._ssl_context is None:
+            ReynoldsAdapter._ssl_context = ssl.create_default_context()
+        
+        # Pooled keep-alive connector so bursts reuse TCP/TLS connections and cached DNS
+        connector = aiohttp.TCPConnector(
+            limit=500,
+            limit_per_host=500,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True,
+            ssl=ReynoldsAdapter._ssl_context,
+        )
+        
         # Create HTTP session with proper configuration
         timeout = ClientTimeout(total=30, connect=10)
         self.session = ClientSession(
+            connector=connector,
             timeout=timeout,
             headers={
                 "User-Agent": "Blue1-RAG-System/1.0",
@@ -97,21 +366,16 @@ class ReynoldsAdapter(BaseDMSAdapter):
             endpoint: API endpoint path
             
         Returns:
-            HMAC signature for authentication
+            HMAC signature for authentication (digest per reynolds_signature_algorithm)
         """
-        import hmac
-        
-        # Create signature string
-        signature_string = f"{timestamp}{method.upper()}{endpoint}{self.dealer_code}"
-        
-        # Generate HMAC-SHA256 signature
-        signature = hmac.new(
-            self.api_key.encode('utf-8'),
-            signature_string.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        
-        return signature
+        h = self._hmac_template.copy()
+        h.update(
+            timestamp.encode('ascii')
+            + method.upper().encode('ascii')
+            + endpoint.encode('utf-8')
+            + self._dealer_code_bytes
+        )
+        return h.hexdigest()
 
     async def authenticate(self) -> None:
         """
@@ -135,20 +399,18 @@ class ReynoldsAdapter(BaseDMSAdapter):
             if self.mfa_token:
                 auth_payload["mfa_token"] = self.mfa_token
             
-            headers = {
-                "X-Reynolds-Dealer-Code": self.dealer_code,
-                "X-Reynolds-Timestamp": timestamp,
-                "X-Reynolds-Signature": signature
-            }
+            headers = CIMultiDict((self._dealer_header, self._content_type_header))
+            headers.add("X-Reynolds-Timestamp", timestamp)
+            headers.add("X-Reynolds-Signature", signature)
             
             async with self.session.post(
-                f"{self.base_url}{endpoint}",
-                json=auth_payload,
+                self._auth_url,
+                data=orjson.dumps(auth_payload),
                 headers=headers
             ) as response:
                 
                 if response.status != 200:
-                    error_text = await response.text()
+                    error_text = await _error_snippet(response)
                     self.auth_failures += 1
                     
                     if response.status == 401:
@@ -164,7 +426,7 @@ class ReynoldsAdapter(BaseDMSAdapter):
                             f"Reynolds authentication failed with status {response.status}: {error_text}"
                         )
                 
-                auth_data = await response.json()
+                auth_data = orjson.loads(await response.read())
                 
                 # Extract session token
                 self.session_token = auth_data.get("session_token")
@@ -175,6 +437,8 @@ class ReynoldsAdapter(BaseDMSAdapter):
                 
                 # Calculate expiration time with 5-minute buffer
                 self.session_expires_at = datetime.now() + timedelta(seconds=expires_in - 300)
+                self._session_expires_monotonic = time.monotonic() + expires_in - 300
+                self._auth_version += 1
                 
                 logger.info(f"Reynolds authentication successful, session expires at {self.session_expires_at}")
                 
@@ -185,42 +449,93 @@ class ReynoldsAdapter(BaseDMSAdapter):
 
     async def ensure_authenticated(self) -> None:
         """Ensure we have a valid session token, refreshing if necessary."""
-        if not self.session_token or not self.session_expires_at:
-            await self.authenticate()
+        version = self._auth_version
+        if not self.session_token or self._session_expires_monotonic is None:
+            await self._refresh_session(version)
             return
         
-        # Check if session is about to expire
-        if datetime.now() >= self.session_expires_at:
+        # Check if session is about to expire (monotonic, so wall-clock steps can't skew it)
+        if time.monotonic() >= self._session_expires_monotonic:
             logger.info("Reynolds session expired, refreshing...")
+            await self._refresh_session(version)
+
+    async def _refresh_session(self, seen_version: int) -> None:
+        """
+        Re-authenticate once on behalf of every caller that saw `seen_version`.
+        
+        Concurrent callers queue on the lock; once the first one has refreshed
+        the session the version no longer matches and the rest reuse its token.
+        """
+        async with self._auth_lock:
+            if self._auth_version != seen_version:
+                return
             await self.authenticate()
 
-    async def check_rate_limit(self) -> None:
+    async def check_rate_limit(self, count: int = 1) -> None:
         """
         Check and enforce rate limiting.
         
+        Args:
+            count: Number of request slots to reserve atomically
+            
         Raises:
+            ValueError: If count is more than a whole window allows
             ReynoldsRateLimitError: If rate limit would be exceeded
         """
-        now = time.time()
-        
-        # Remove timestamps outside the current window
-        self.request_timestamps = [
-            ts for ts in self.request_timestamps 
-            if now - ts < self.rate_window
-        ]
-        
-        # Check if we're at the limit
-        if len(self.request_timestamps) >= self.rate_limit:
-            self.rate_limit_hits += 1
-            oldest_request = min(self.request_timestamps)
-            wait_time = self.rate_window - (now - oldest_request)
-            
-            raise ReynoldsRateLimitError(
-                f"Reynolds rate limit exceeded. Wait {wait_time:.0f} seconds before next request."
+        if count > self.rate_limit:
+            raise ValueError(
+                f"Cannot reserve {count} Reynolds requests at once; the limit is "
+                f"{self.rate_limit} per {self.rate_window} seconds"
             )
         
-        # Record this request
-        self.request_timestamps.append(now)
+        async with self._rate_limit_lock:
+            now = time.monotonic()
+            self._prune_request_timestamps(now)
+            
+            # Check if we're at the limit
+            if len(self.request_timestamps) + count > self.rate_limit:
+                self.rate_limit_hits += 1
+                wait_time = self._rate_limit_wait(now)
+                
+                raise ReynoldsRateLimitError(
+                    f"Reynolds rate limit exceeded. Wait {wait_time:.0f} seconds before next request."
+                )
+            
+            # Record the reserved requests
+            self.request_timestamps.extend([now] * count)
+
+    async def reserve_available_requests(self, count: int) -> tuple[int, float]:
+        """
+        Reserve as many of `count` request slots as the current window still allows.
+        
+        Args:
+            count: Number of request slots wanted
+            
+        Returns:
+            (slots reserved, seconds until the next slot frees up when none were reserved)
+        """
+        async with self._rate_limit_lock:
+            now = time.monotonic()
+            self._prune_request_timestamps(now)
+            
+            granted = min(count, self.rate_limit - len(self.request_timestamps))
+            if granted <= 0:
+                self.rate_limit_hits += 1
+                return 0, self._rate_limit_wait(now)
+            
+            self.request_timestamps.extend([now] * granted)
+            return granted, 0.0
+
+    def _prune_request_timestamps(self, now: float) -> None:
+        """Drop timestamps outside the current window (oldest first)."""
+        while self.request_timestamps and now - self.request_timestamps[0] >= self.rate_window:
+            self.request_timestamps.popleft()
+
+    def _rate_limit_wait(self, now: float) -> float:
+        """Seconds until the oldest request in the window expires."""
+        if not self.request_timestamps:
+            return 0.0
+        return self.rate_window - (now - self.request_timestamps[0])
 
     async def make_authenticated_request(
         self,
@@ -228,7 +543,8 @@ class ReynoldsAdapter(BaseDMSAdapter):
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         json_data: Optional[Dict[str, Any]] = None,
-        max_retries: int = 3
+        max_retries: int = 3,
+        rate_limit_reserved: bool = False,
     ) -> Dict[str, Any]:
         """
         Make authenticated request to Reynolds API with comprehensive error handling.
@@ -239,6 +555,7 @@ class ReynoldsAdapter(BaseDMSAdapter):
             params: Query parameters
             json_data: JSON payload
             max_retries: Maximum retry attempts
+            rate_limit_reserved: Caller already reserved a slot via check_rate_limit
             
         Returns:
             JSON response data
@@ -250,19 +567,57 @@ class ReynoldsAdapter(BaseDMSAdapter):
         if not self.session:
             raise ReynoldsAuthenticationError("Reynolds adapter not initialized")
         
+        method = method.upper()
+        if method not in _COALESCED_METHODS:
+            return await self._send_request(
+                method, endpoint, params, json_data, max_retries, rate_limit_reserved
+            )
+        
+        # Single-flight: identical concurrent GETs share one HTTP call
+        key = (
+            method,
+            endpoint,
+            orjson.dumps(params, option=_REQUEST_KEY_OPTIONS, default=repr),
+            orjson.dumps(json_data, option=_REQUEST_KEY_OPTIONS, default=repr),
+        )
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._send_request(
+                    method, endpoint, params, json_data, max_retries, rate_limit_reserved
+                )
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # Shield so one cancelled caller doesn't cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        json_data: Optional[Dict[str, Any]],
+        max_retries: int,
+        rate_limit_reserved: bool,
+    ) -> Dict[str, Any]:
+        """Send one request with rate limiting, re-authentication and retries."""
         # Check rate limiting
-        await self.check_rate_limit()
+        if not rate_limit_reserved:
+            await self.check_rate_limit()
         
         # Ensure we're authenticated
         await self.ensure_authenticated()
+        auth_version = self._auth_version
         
-        url = f"{self.base_url}{endpoint}"
-        headers = {
-            "Authorization": f"Bearer {self.session_token}",
-            "X-Reynolds-Dealer-Code": self.dealer_code
-        }
+        url = _build_url(self.base_url, endpoint)
+        headers = CIMultiDict((self._dealer_header, self._content_type_header))
+        headers.add("Authorization", f"Bearer {self.session_token}")
+        body = orjson.dumps(json_data) if json_data is not None else None
         
         last_exception = None
+        wait_time = 1.0
         
         for attempt in range(max_retries):
             try:
@@ -272,14 +627,15 @@ class ReynoldsAdapter(BaseDMSAdapter):
                     method=method,
                     url=url,
                     params=params,
-                    json=json_data,
+                    data=body,
                     headers=headers
                 ) as response:
                     
                     # Handle authentication errors
                     if response.status == 401:
                         logger.warning(f"Reynolds request got 401, attempting re-authentication (attempt {attempt + 1})")
-                        await self.authenticate()
+                        await self._refresh_session(auth_version)
+                        auth_version = self._auth_version
                         headers["Authorization"] = f"Bearer {self.session_token}"
                         continue
                     
@@ -295,21 +651,21 @@ class ReynoldsAdapter(BaseDMSAdapter):
                     
                     # Handle other errors
                     if response.status >= 400:
-                        error_text = await response.text()
+                        error_text = await _error_snippet(response)
                         self.failed_requests += 1
                         raise Exception(f"Reynolds API error {response.status}: {error_text}")
                     
                     # Success
-                    return await response.json()
+                    return orjson.loads(await response.read())
                     
             except Exception as e:
                 last_exception = e
                 if attempt == max_retries - 1:
                     break
                 
-                # Exponential backoff for retries
-                wait_time = 2 ** attempt
-                logger.warning(f"Reynolds request failed (attempt {attempt + 1}), retrying in {wait_time}s: {e}")
+                # Decorrelated jitter keeps concurrent retries from synchronising
+                wait_time = min(30.0, random.uniform(1.0, wait_time * 3))
+                logger.warning(f"Reynolds request failed (attempt {attempt + 1}), retrying in {wait_time:.1f}s: {e}")
                 await asyncio.sleep(wait_time)
         
         # All retries failed
@@ -334,60 +690,14 @@ class ReynoldsAdapter(BaseDMSAdapter):
             List of Vehicle objects
         """
         try:
-            params = {
-                "limit": min(limit, 200),  # Reynolds max limit
-                "offset": offset,
-                "dealer_code": self.dealer_code
-            }
-            
-            # Add filters
-            if filters:
-                if "make" in filters:
-                    params["make"] = filters["make"]
-                if "model" in filters:
-                    params["model"] = filters["model"]
-                if "year" in filters:
-                    params["year"] = filters["year"]
-                if "status" in filters:
-                    params["status"] = filters["status"]
-                if "type" in filters:
-                    params["type"] = filters["type"]  # new, used, lease_return
-            
             # Make request to Reynolds inventory endpoint
             response_data = await self.make_authenticated_request(
                 method="GET",
                 endpoint="/inventory/vehicles",
-                params=params
+                params=self._inventory_params(filters, limit, offset)
             )
             
-            # Parse response into Vehicle objects
-            vehicles = []
-            for item in response_data.get("vehicles", []):
-                try:
-                    vehicle = Vehicle(
-                        vin=item["vin"],
-                        make=item["make"],
-                        model=item["model"],
-                        year=int(item["model_year"]),
-                        trim=item.get("trim_level", ""),
-                        color=item.get("exterior_color", ""),
-                        mileage=item.get("odometer", 0),
-                        price=float(item.get("asking_price", 0)),
-                        status=item.get("status", "available"),
-                        category=item.get("type", "unknown"),
-                        features=item.get("options", []),
-                        images=item.get("images", []),
-                        location=item.get("lot_location", ""),
-                        dealer_id=self.dealer_code,
-                        last_updated=datetime.fromisoformat(
-                            item.get("last_modified", datetime.now().isoformat())
-                        )
-                    )
-                    vehicles.append(vehicle)
-                except Exception as e:
-                    logger.warning(f"Failed to parse Reynolds vehicle {item.get('vin', 'unknown')}: {e}")
-                    continue
-            
+            vehicles = self._parse_inventory_page(response_data)
             logger.info(f"Retrieved {len(vehicles)} vehicles from Reynolds inventory")
             return vehicles
             
@@ -395,6 +705,303 @@ class ReynoldsAdapter(BaseDMSAdapter):
             logger.error(f"Reynolds inventory retrieval failed: {e}")
             return []
 
+    async def get_inventory_all(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        total: Optional[int] = None,
+        max_concurrency: int = 8,
+    ) -> List[Vehicle]:
+        """
+        Get inventory beyond a single page, fetching the remaining pages concurrently.
+        
+        Args:
+            filters: Dictionary of filters (make, model, year, etc.)
+            total: Maximum number of vehicles to return (defaults to everything Reynolds reports)
+            max_concurrency: Maximum number of page requests in flight at once
+            
+        Returns:
+            List of Vehicle objects
+            
+        Raises:
+            Exception: If any page request fails; a partial inventory is never returned
+        """
+        try:
+            # The first page tells us how many vehicles match
+            first_page = await self.make_authenticated_request(
+                method="GET",
+                endpoint="/inventory/vehicles",
+                params=self._inventory_params(filters, INVENTORY_PAGE_SIZE, 0)
+            )
+            
+            available = first_page.get("total", len(first_page.get("vehicles", [])))
+            target = available if total is None else min(total, available)
+            offsets = list(range(INVENTORY_PAGE_SIZE, target, INVENTORY_PAGE_SIZE))
+            
+            pages = [first_page]
+            semaphore = asyncio.Semaphore(max_concurrency)
+            
+            async def fetch_page(page_offset: int) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self.make_authenticated_request(
+                        method="GET",
+                        endpoint="/inventory/vehicles",
+                        params=self._inventory_params(filters, INVENTORY_PAGE_SIZE, page_offset),
+                        rate_limit_reserved=True,
+                    )
+            
+            # Reserve pages in chunks that fit the remaining rate-limit budget,
+            # waiting for the window to move on when it is used up
+            while offsets:
+                granted, wait_time = await self.reserve_available_requests(len(offsets))
+                if not granted:
+                    logger.info(
+                        f"Reynolds rate limit reached, waiting {wait_time:.0f}s "
+                        f"for {len(offsets)} remaining inventory pages"
+                    )
+                    await asyncio.sleep(wait_time)
+                    continue
+                
+                chunk, offsets = offsets[:granted], offsets[granted:]
+                pages.extend(await asyncio.gather(*(fetch_page(o) for o in chunk)))
+            
+            vehicles = []
+            for page in pages:
+                vehicles.extend(self._parse_inventory_page(page))
+            if total is not None:
+                vehicles = vehicles[:total]
+            
+            logger.info(
+                f"Retrieved {len(vehicles)} vehicles from Reynolds inventory across {len(pages)} pages"
+            )
+            return vehicles
+            
+        except Exception as e:
+            logger.error(f"Reynolds paginated inventory retrieval failed: {e}")
+            raise
+
+    async def get_inventory_stream(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = INVENTORY_PAGE_SIZE,
+    ) -> AsyncIterator[Vehicle]:
+        """
+        Stream the full inventory, prefetching the next page while the current one is parsed.
+        
+        Args:
+            filters: Dictionary of filters (make, model, year, etc.)
+            page_size: Vehicles per page request (capped at the Reynolds maximum)
+            
+        Yields:
+            Vehicle objects in inventory order
+            
+        Raises:
+            DMSError: If a page request fails; the stream never ends early silently
+        """
+        page_size = min(page_size, INVENTORY_PAGE_SIZE)
+        
+        async def request_page(page_offset: int) -> Dict[str, Any]:
+            # Reserve each page against the rate-limit budget, waiting out a full window
+            while True:
+                granted, wait_time = await self.reserve_available_requests(1)
+                if granted:
+                    break
+                logger.info(f"Reynolds rate limit reached, waiting {wait_time:.0f}s for inventory page")
+                await asyncio.sleep(wait_time)
+            
+            return await self.make_authenticated_request(
+                method="GET",
+                endpoint="/inventory/vehicles",
+                params=self._inventory_params(filters, page_size, page_offset),
+                rate_limit_reserved=True,
+            )
+        
+        def fetch_page(page_offset: int) -> asyncio.Task:
+            return asyncio.create_task(request_page(page_offset))
+        
+        offset = 0
+        pending: Optional[asyncio.Task] = fetch_page(offset)
+        try:
+            while pending is not None:
+                response_data = await pending
+                items = response_data.get("vehicles", [])
+                offset += page_size
+                
+                # Start the next request before parsing so network time hides parse time
+                total = response_data.get("total")
+                has_more = len(items) == page_size and (total is None or offset < total)
+                pending = fetch_page(offset) if has_more else None
+                
+                for vehicle in self._parse_inventory_page(response_data):
+                    yield vehicle
+        except Exception as e:
+            logger.error(f"Reynolds inventory stream failed at offset {offset}: {e}")
+            raise DMSError(f"Reynolds inventory stream failed at offset {offset}: {e}") from e
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+
+    async def get_inventory_batch(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> VehicleBatch:
+        """
+        Get one inventory page as a columnar VehicleBatch.
+        
+        Numeric columns are filled up front; Vehicle objects are built lazily
+        when rows are accessed, which keeps large result sets compact.
+        
+        Args:
+            filters: Dictionary of filters (make, model, year, etc.)
+            limit: Maximum number of vehicles to return
+            offset: Number of vehicles to skip for pagination
+            
+        Returns:
+            VehicleBatch for the requested page (empty on failure)
+        """
+        try:
+            response_data = await self.make_authenticated_request(
+                method="GET",
+                endpoint="/inventory/vehicles",
+                params=self._inventory_params(filters, limit, offset)
+            )
+            items = response_data.get("vehicles", [])
+        except Exception as e:
+            logger.error(f"Reynolds inventory batch retrieval failed: {e}")
+            items = []
+        
+        return self._build_vehicle_batch(items)
+
+    def _build_vehicle_batch(self, items: List[Dict[str, Any]]) -> VehicleBatch:
+        """
+        Pack raw inventory records into a VehicleBatch, skipping malformed rows.
+        
+        Rows are checked here rather than when accessed, so the batch holds the
+        same vehicles _parse_inventory_page would return.
+        """
+        records = []
+        for item in items:
+            error = _vehicle_record_error(item)
+            if error is None:
+                records.append(item)
+            else:
+                logger.warning(f"Failed to parse Reynolds vehicle {item.get('vin', 'unknown')}: {error}")
+        
+        # Coerce each numeric column in one C loop rather than per-row int()/float() calls
+        count = len(records)
+        try:
+            years = np.fromiter((item["model_year"] for item in records), dtype=np.int16, count=count)
+            prices = np.fromiter(
+                (item.get("asking_price", 0) for item in records), dtype=np.float64, count=count
+            )
+            mileage = np.fromiter(
+                (item.get("odometer", 0) for item in records), dtype=np.int32, count=count
+            )
+            # fromiter maps None to NaN for float columns where float() would have raised
+            columns_ok = not np.isnan(prices).any()
+        except (TypeError, ValueError, OverflowError):
+            columns_ok = False
+        
+        if not columns_ok:
+            return self._build_vehicle_batch_rowwise(records)
+        
+        return self._vehicle_batch(records, years, prices, mileage)
+
+    def _build_vehicle_batch_rowwise(self, items: List[Dict[str, Any]]) -> VehicleBatch:
+        """Slow path for pages with malformed numeric values: coerce and filter row by row."""
+        records, years, prices, mileage = [], [], [], []
+        for item in items:
+            try:
+                row = (
+                    int(item["model_year"]),
+                    float(item.get("asking_price", 0)),
+                    int(item.get("odometer", 0)),
+                )
+            except Exception as e:
+                logger.warning(f"Failed to parse Reynolds vehicle {item.get('vin', 'unknown')}: {e}")
+                continue
+            records.append(item)
+            years.append(row[0])
+            prices.append(row[1])
+            mileage.append(row[2])
+        
+        return self._vehicle_batch(
+            records,
+            np.array(years, dtype=np.int16),
+            np.array(prices, dtype=np.float64),
+            np.array(mileage, dtype=np.int32),
+        )
+
+    def _vehicle_batch(
+        self,
+        records: List[Dict[str, Any]],
+        years: np.ndarray,
+        prices: np.ndarray,
+        mileage: np.ndarray,
+    ) -> VehicleBatch:
+        """Assemble a VehicleBatch whose rows parse lazily into Vehicle objects."""
+        now = datetime.now()
+        dealer_code = self.dealer_code
+        return VehicleBatch(
+            dealer_id=dealer_code,
+            vins=[item["vin"] for item in records],
+            years=years,
+            prices=prices,
+            mileage=mileage,
+            vin_valid=_record_vin_mask(records),
+            records=records,
+            parser=lambda item, vin_valid: _parse_vehicle(item, dealer_code, now, vin_valid=vin_valid),
+        )
+
+    def _inventory_params(
+        self,
+        filters: Optional[Dict[str, Any]],
+        limit: int,
+        offset: int,
+    ) -> Dict[str, Any]:
+        """Build query parameters for the inventory endpoint."""
+        params = {
+            "limit": min(limit, INVENTORY_PAGE_SIZE),  # Reynolds max limit
+            "offset": offset,
+            "dealer_code": self.dealer_code
+        }
+        
+        # Add filters
+        if filters:
+            if "make" in filters:
+                params["make"] = filters["make"]
+            if "model" in filters:
+                params["model"] = filters["model"]
+            if "year" in filters:
+                params["year"] = filters["year"]
+            if "status" in filters:
+                params["status"] = filters["status"]
+            if "type" in filters:
+                params["type"] = filters["type"]  # new, used, lease_return
+        
+        return params
+
+    def _parse_inventory_page(self, response_data: Dict[str, Any]) -> List[Vehicle]:
+        """
+        Parse one inventory response into Vehicle objects, skipping unparseable records.
+        
+        Vehicles whose VIN fails the format check (legacy, pre-1981 or placeholder
+        VINs) are kept with vin_valid=False rather than dropped.
+        """
+        vehicles = []
+        now = datetime.now()
+        items = response_data.get("vehicles", [])
+        # One vectorised check for the whole page
+        for item, vin_ok in zip(items, _record_vin_mask(items).tolist()):
+            if not vin_ok:
+                logger.warning(f"Reynolds vehicle has malformed VIN {item.get('vin', 'unknown')}")
+            try:
+                vehicles.append(_parse_vehicle(item, self.dealer_code, now, vin_valid=vin_ok))
+            except Exception as e:
+                logger.warning(f"Failed to parse Reynolds vehicle {item.get('vin', 'unknown')}: {e}")
+        return vehicles
+
     async def get_vehicle_details(self, vin: str) -> Optional[Vehicle]:
         """
         Get detailed information for a specific vehicle by VIN.
@@ -406,7 +1013,7 @@ class ReynoldsAdapter(BaseDMSAdapter):
             Vehicle object or None if not found
         """
         try:
-            if not vin or len(vin) != 17:
+            if not vin or len(vin) != VIN_LENGTH:
                 logger.warning(f"Invalid VIN provided: {vin}")
                 return None
             
@@ -423,38 +1030,7 @@ class ReynoldsAdapter(BaseDMSAdapter):
                 return None
             
             # Create detailed Vehicle object
-            vehicle = Vehicle(
-                vin=item["vin"],
-                make=item["make"],
-                model=item["model"],
-                year=int(item["model_year"]),
-                trim=item.get("trim_level", ""),
-                color=item.get("exterior_color", ""),
-                mileage=item.get("odometer", 0),
-                price=float(item.get("asking_price", 0)),
-                status=item.get("status", "available"),
-                category=item.get("type", "unknown"),
-                features=item.get("options", []),
-                images=item.get("images", []),
-                location=item.get("lot_location", ""),
-                dealer_id=self.dealer_code,
-                last_updated=datetime.fromisoformat(
-                    item.get("last_modified", datetime.now().isoformat())
-                ),
-                # Detailed fields
-                engine=item.get("engine", ""),
-                transmission=item.get("transmission", ""),
-                drivetrain=item.get("drivetrain", ""),
-                fuel_type=item.get("fuel_type", ""),
-                mpg_city=item.get("mpg_city", 0),
-                mpg_highway=item.get("mpg_highway", 0),
-                interior_color=item.get("interior_color", ""),
-                body_style=item.get("body_style", ""),
-                doors=item.get("doors", 0),
-                msrp=float(item.get("msrp", 0)),
-                invoice=float(item.get("invoice", 0)),
-                cost=float(item.get("cost", 0)),
-            )
+            vehicle = _parse_vehicle(item, self.dealer_code, datetime.now(), detailed=True)
             
             logger.info(f"Retrieved detailed information for vehicle {vin}")
             return vehicle
@@ -474,7 +1050,7 @@ class ReynoldsAdapter(BaseDMSAdapter):
             List of service records
         """
         try:
-            if not vin or len(vin) != 17:
+            if not vin or len(vin) != VIN_LENGTH:
                 logger.warning(f"Invalid VIN provided: {vin}")
                 return []
             
@@ -488,25 +1064,7 @@ class ReynoldsAdapter(BaseDMSAdapter):
             service_records = []
             for record in response_data.get("service_records", []):
                 try:
-                    service_record = {
-                        "service_id": record["repair_order_number"],
-                        "vin": vin,
-                        "date": record["service_date"],
-                        "mileage": record.get("mileage_in", 0),
-                        "type": record.get("service_type", "unknown"),
-                        "description": record.get("customer_concern", ""),
-                        "work_performed": record.get("work_performed", ""),
-                        "parts_used": record.get("parts", []),
-                        "labor_hours": record.get("total_labor_hours", 0),
-                        "parts_cost": float(record.get("parts_total", 0)),
-                        "labor_cost": float(record.get("labor_total", 0)),
-                        "total_cost": float(record.get("total_amount", 0)),
-                        "technician": record.get("technician_name", ""),
-                        "service_advisor": record.get("service_advisor", ""),
-                        "warranty_work": record.get("warranty_flag", False),
-                        "customer_pay": record.get("customer_pay_flag", True),
-                        "dealer_id": self.dealer_code
-                    }
+                    service_record = _parse_service_record(record, vin, self.dealer_code)
                     service_records.append(service_record)
                 except Exception as e:
                     logger.warning(f"Failed to parse Reynolds service record: {e}")
@@ -568,6 +1126,8 @@ class ReynoldsAdapter(BaseDMSAdapter):
         """Clean up resources."""
         if self.session:
             await self.session.close()
+            # Give the connector time to finish SSL shutdown of pooled connections
+            await asyncio.sleep(0.25)
         
         logger.info(
             f"Reynolds adapter closed - Total requests: {self.total_requests}, "
@@ -7,13 +7,19 @@ License: Commercial use requires valid license agreement
 """
 
 import asyncio
-import hashlib
+import itertools
 import logging
+import multiprocessing
+import os
 import time
-from typing import Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Iterable, Iterator, Optional
 
+import numpy as np
 import redis.asyncio as redis
-import voyageai
+import xxhash
 from langchain.schema import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
@@ -21,6 +27,120 @@ from .config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Embeddings are cached as packed binary rather than JSON text:
+# float32 (4 bytes/dim) by default, int8 (1 byte/dim) when Voyage returns quantized vectors
+EMBEDDING_CACHE_DTYPES = {
+    "float": np.float32,
+    "int8": np.int8,
+}
+
+# Cached payload framing: 1 version byte, 1 dtype byte, then the raw vector bytes.
+# "qint8" is a float vector stored as symmetric int8 plus a trailing float32 scale.
+EMBEDDING_CACHE_FORMAT_VERSION = 1
+_EMBEDDING_DTYPE_CODES = {"float": 1, "int8": 2, "qint8": 3}
+_EMBEDDING_CODE_DTYPES = {
+    code: EMBEDDING_CACHE_DTYPES[name]
+    for name, code in _EMBEDDING_DTYPE_CODES.items()
+    if name in EMBEDDING_CACHE_DTYPES
+}
+_QINT8_CODE = _EMBEDDING_DTYPE_CODES["qint8"]
+
+
+def _encode_embedding(embedding: list[float], output_dtype: str = "float") -> bytes:
+    """Pack an embedding into a framed binary payload for Redis."""
+    header = bytes((EMBEDDING_CACHE_FORMAT_VERSION, _EMBEDDING_DTYPE_CODES[output_dtype]))
+    if output_dtype == "qint8":
+        vector = np.asarray(embedding, dtype=np.float32)
+        scale = float(np.max(np.abs(vector))) if vector.size else 0.0
+        quantized = np.round(vector * (127.0 / scale)) if scale else np.zeros_like(vector)
+        return header + quantized.astype(np.int8).tobytes() + np.float32(scale).tobytes()
+    return header + np.asarray(embedding, dtype=EMBEDDING_CACHE_DTYPES[output_dtype]).tobytes()
+
+
+def _decode_embedding(raw: bytes) -> Optional[list[float]]:
+    """Unpack a cached payload with a single buffer view; None if the framing is unrecognized."""
+    if len(raw) < 2 or raw[0] != EMBEDDING_CACHE_FORMAT_VERSION:
+        return None
+    if raw[1] == _QINT8_CODE:
+        if len(raw) < 6:
+            return None
+        scale = np.frombuffer(raw, dtype=np.float32, offset=len(raw) - 4)[0]
+        quantized = np.frombuffer(raw, dtype=np.int8, count=len(raw) - 6, offset=2)
+        return (quantized.astype(np.float32) * (scale / 127.0)).tolist()
+    dtype = _EMBEDDING_CODE_DTYPES.get(raw[1])
+    # Truncated or corrupt payloads don't fill a whole number of elements
+    if dtype is None or (len(raw) - 2) % np.dtype(dtype).itemsize:
+        return None
+    return np.frombuffer(raw, dtype=dtype, offset=2).tolist()
+
+
+# Text splitting is CPU-bound regex work; large document sets are split in worker processes
+TEXT_SEPARATORS = ["\n\n", "\n", " ", ""]
+PARALLEL_SPLIT_MIN_DOCUMENTS = 256
+SPLIT_WORKERS = max(1, min(8, os.cpu_count() or 1))
+
+
+def _split_document_slice(
+    chunk_size: int,
+    chunk_overlap: int,
+    separators: list[str],
+    documents: list[Document],
+) -> list[Document]:
+    """Split one slice of documents inside a worker process."""
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        separators=separators,
+    )
+    return splitter.split_documents(documents)
+
+
+# Seconds a cache call waits for a free pooled Redis connection
+REDIS_POOL_TIMEOUT = 5.0
+
+# Single cache writes are queued and flushed to Redis in pipelines of up to this many keys
+CACHE_WRITE_BATCH_SIZE = 256
+CACHE_WRITE_FLUSH_INTERVAL = 0.005
+CACHE_WRITE_QUEUE_SIZE = 10_000
+
+# Voyage caps each request at 128 inputs and 120K tokens; tokens are estimated at ~4 chars each
+VOYAGE_MAX_BATCH_TOKENS = 120_000
+APPROX_CHARS_PER_TOKEN = 4
+
+
+def _pack_token_batches(
+    texts: list[str], positions: list[int], max_items: int, max_tokens: int = VOYAGE_MAX_BATCH_TOKENS
+) -> list[list[int]]:
+    """
+    Pack text positions into request batches by first-fit-decreasing on estimated tokens.
+    
+    Longest texts are placed first so that a few long inputs fill their own
+    batches instead of forcing every batch to stay small.
+    """
+    estimates = {pos: len(texts[pos]) // APPROX_CHARS_PER_TOKEN + 1 for pos in positions}
+    batches: list[list[int]] = []
+    batch_tokens: list[int] = []
+    
+    for pos in sorted(positions, key=estimates.__getitem__, reverse=True):
+        tokens = estimates[pos]
+        for b, batch in enumerate(batches):
+            if len(batch) < max_items and batch_tokens[b] + tokens <= max_tokens:
+                batch.append(pos)
+                batch_tokens[b] += tokens
+                break
+        else:
+            batches.append([pos])
+            batch_tokens.append(tokens)
+    
+    return batches
+
+
+# While a coalesced Voyage call is in flight, new embed_single calls are collected
+# for this long and sent as one request; an idle embedder sends them at once
+SINGLE_EMBED_COALESCE_WINDOW = 0.005
+SINGLE_EMBED_MAX_BATCH = 128
+
 
 class EmbeddingError(Exception):
     """Custom exception for embedding-related errors."""
@@ -39,19 +159,39 @@ class VoyageEmbedder:
         
         if not self.config.voyage_api_key:
             raise EmbeddingError("Voyage AI API key not configured - check VOYAGE_API_KEY environment variable")
-            
-        try:
-            self.client = voyageai.Client(api_key=self.config.voyage_api_key)
-        except Exception as e:
-            raise EmbeddingError(f"Failed to initialize Voyage AI client: {str(e)}", e)
-            
-        self.redis_client: Optional[redis.Redis] = None
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.config.chunk_size,
-            chunk_overlap=self.config.chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", " ", ""],
+        
+        # Voyage client and text splitter are built on first use, so split-only jobs skip the SDK
+        self._client = None
+        self._text_splitter: Optional[RecursiveCharacterTextSplitter] = None
+        # Namespace cache keys by dtype so float and int8 entries never collide
+        self._cache_key_prefix = f"embedding:v4:{self.config.voyage_output_dtype}:"
+        # Float vectors can optionally be stored as scaled int8 to cut cache bandwidth 4x
+        self._cache_encoding = (
+            "qint8"
+            if self.config.embedding_cache_quantize and self.config.voyage_output_dtype == "float"
+            else self.config.voyage_output_dtype
         )
+        self._cache_key_hashers: dict[str, "xxhash.xxh3_128"] = {}
+        self.redis_client: Optional[redis.Redis] = None
+        self.redis_pool: Optional[redis.ConnectionPool] = None
+        # Hot cache_key -> embedding entries served without a Redis round trip
+        # Entries hold the packed cache payload (about 4 KB per 1024-dim float32 vector)
+        # rather than a list of Python floats, which would cost roughly 8x as much
+        self._local_cache: OrderedDict[str, bytes] = OrderedDict()
+        self._local_cache_max = self.config.embedding_local_cache_size
+        # Write-behind queue for single cache writes, drained in pipelines by a background task
+        self._cache_write_queue: Optional[asyncio.Queue[tuple[str, bytes]]] = None
+        self._cache_flush_task: Optional[asyncio.Task] = None
+        # embed_single calls waiting to be sent together, keyed by (model, input_type)
+        self._pending_single: dict[tuple[str, str], list[tuple[str, str, asyncio.Future]]] = {}
+        self._single_flush_task: Optional[asyncio.Task] = None
+        # Cache misses from those calls waiting for Voyage, keyed the same way, then by text
+        self._pending_misses: dict[tuple[str, str], dict[str, list[tuple[str, asyncio.Future]]]] = {}
+        self._single_embed_task: Optional[asyncio.Task] = None
+        # Coalesced embed_single API calls currently waiting on Voyage
+        self._single_embeds_in_flight = 0
+        # Worker processes for split_documents_async, started on first large split
+        self._split_executor: Optional[ProcessPoolExecutor] = None
         
         # Performance tracking for production monitoring
         self.embedding_cache_hits = 0
@@ -60,26 +200,86 @@ class VoyageEmbedder:
         self.total_api_calls = 0
         self.total_api_errors = 0
 
+    @property
+    def client(self):
+        """Voyage AI async client, imported and constructed on first access."""
+        if self._client is None:
+            import voyageai
+            
+            try:
+                # Native async client: embed calls run on the event loop instead of a worker thread
+                self._client = voyageai.AsyncClient(api_key=self.config.voyage_api_key)
+            except Exception as e:
+                raise EmbeddingError(f"Failed to initialize Voyage AI client: {str(e)}", e)
+        return self._client
+
+    @client.setter
+    def client(self, value) -> None:
+        self._client = value
+
+    @property
+    def text_splitter(self) -> RecursiveCharacterTextSplitter:
+        """Text splitter, constructed on first use."""
+        if self._text_splitter is None:
+            self._text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=self.config.chunk_size,
+                chunk_overlap=self.config.chunk_overlap,
+                length_function=len,
+                separators=TEXT_SEPARATORS,
+            )
+        return self._text_splitter
+
     async def initialize_cache(self) -> None:
         """Initialize Redis cache connection with comprehensive error handling."""
         try:
-            self.redis_client = redis.from_url(
+            # Explicit pool so concurrent sub-batches get their own connections;
+            # size it at roughly 2x embed_concurrency, with headroom for other callers.
+            # Blocking, so callers wait for a free connection under load rather than
+            # failing with "Too many connections"
+            self.redis_pool = redis.BlockingConnectionPool.from_url(
                 self.config.redis_url,
+                max_connections=max(32, 2 * self.config.embed_concurrency),
+                timeout=REDIS_POOL_TIMEOUT,
                 socket_connect_timeout=5,
                 socket_keepalive=True,
                 retry_on_timeout=True,
                 health_check_interval=30,
             )
+            self.redis_client = redis.Redis(connection_pool=self.redis_pool)
             await self.redis_client.ping()
+            self._cache_write_queue = asyncio.Queue(maxsize=CACHE_WRITE_QUEUE_SIZE)
+            self._cache_flush_task = asyncio.create_task(self._flush_cache_writes())
             logger.info("Redis cache connection established successfully")
         except Exception as e:
             logger.warning(f"Redis cache unavailable, operating without cache: {e}")
+            if self.redis_pool:
+                await self.redis_pool.disconnect()
             self.redis_client = None
+            self.redis_pool = None
 
     async def close(self) -> None:
         """Clean up resources and log final statistics."""
+        if self._cache_flush_task:
+            # Let queued cache writes reach Redis before the connections go away
+            try:
+                async with asyncio.timeout(5.0):
+                    await self._cache_write_queue.join()
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Dropping {self._cache_write_queue.qsize()} pending cache writes on shutdown"
+                )
+            self._cache_flush_task.cancel()
+            self._cache_flush_task = None
+            self._cache_write_queue = None
+        
         if self.redis_client:
             await self.redis_client.close()
+        if self.redis_pool:
+            await self.redis_pool.disconnect()
+        
+        if self._split_executor:
+            self._split_executor.shutdown(wait=False, cancel_futures=True)
+            self._split_executor = None
         
         logger.info(
             f"Embedding service statistics - "
@@ -90,44 +290,153 @@ class VoyageEmbedder:
             f"Cache misses: {self.embedding_cache_misses}"
         )
 
+    def _embed_options(self) -> dict[str, Any]:
+        """Extra Voyage embed() arguments; output_dtype is only sent when quantizing."""
+        if self.config.voyage_output_dtype == "float":
+            return {}
+        return {"output_dtype": self.config.voyage_output_dtype}
+
+    def _cache_key_hasher(self, model: str) -> "xxhash.xxh3_128":
+        """Hasher already fed the '<model>:' prefix; copy it per text instead of rebuilding it."""
+        hasher = self._cache_key_hashers.get(model)
+        if hasher is None:
+            hasher = xxhash.xxh3_128(f"{model}:".encode('utf-8'))
+            self._cache_key_hashers[model] = hasher
+        return hasher
+
     def _generate_cache_key(self, text: str, model: str) -> str:
         """Generate deterministic cache key for text embedding."""
-        # Use SHA-256 for security and collision resistance
-        content = f"{model}:{text}".encode('utf-8')
-        return f"embedding:v1:{hashlib.sha256(content).hexdigest()[:32]}"
+        # Content-addressed internal key: a fast non-cryptographic 128-bit hash is enough
+        hasher = self._cache_key_hasher(model).copy()
+        hasher.update(text.encode('utf-8'))
+        return self._cache_key_prefix + hasher.hexdigest()
 
-    async def _get_cached_embedding(self, cache_key: str) -> Optional[list[float]]:
-        """Retrieve embedding from cache with error handling."""
-        if not self.redis_client:
-            return None
+    def _generate_cache_keys(self, texts: list[str], model: str) -> list[str]:
+        """Generate cache keys for a batch, hashing the shared model prefix only once."""
+        key_prefix = self._cache_key_prefix
+        seeded = self._cache_key_hasher(model)
+        
+        keys = []
+        for text in texts:
+            hasher = seeded.copy()
+            hasher.update(text.encode('utf-8'))
+            keys.append(key_prefix + hasher.hexdigest())
+        return keys
 
-        try:
-            cached_data = await self.redis_client.get(cache_key)
-            if cached_data:
-                import json
-                self.embedding_cache_hits += 1
-                return json.loads(cached_data)
-        except Exception as e:
-            logger.warning(f"Cache retrieval error for key {cache_key[:16]}...: {e}")
+    def _local_cache_get(self, cache_key: str) -> Optional[list[float]]:
+        """Look up the in-process LRU, refreshing the entry's recency on a hit."""
+        payload = self._local_cache.get(cache_key)
+        if payload is None:
+            return None
+        self._local_cache.move_to_end(cache_key)
+        return _decode_embedding(payload)
 
-        self.embedding_cache_misses += 1
-        return None
+    def _local_cache_put(self, cache_key: str, payload: bytes) -> None:
+        """Insert an encoded embedding into the in-process LRU, evicting the least recently used entries."""
+        if self._local_cache_max <= 0:
+            return
+        self._local_cache[cache_key] = payload
+        self._local_cache.move_to_end(cache_key)
+        while len(self._local_cache) > self._local_cache_max:
+            self._local_cache.popitem(last=False)
 
     async def _cache_embedding(self, cache_key: str, embedding: list[float]) -> None:
         """Store embedding in cache with error handling and TTL."""
+        payload = _encode_embedding(embedding, self._cache_encoding)
+        self._local_cache_put(cache_key, payload)
         if not self.redis_client:
             return
 
+        if self._cache_write_queue is not None:
+            # Coalesced into the flusher's next pipeline instead of one round trip per call
+            try:
+                self._cache_write_queue.put_nowait((cache_key, payload))
+            except asyncio.QueueFull:
+                logger.warning(f"Cache write queue full, dropping write for key {cache_key[:16]}...")
+            return
+
         try:
-            import json
-            await self.redis_client.setex(
+            # NX: embeddings are content-addressed, so the first writer wins and races don't rewrite
+            await self.redis_client.set(
                 cache_key,
-                86400,  # 24-hour cache expiration
-                json.dumps(embedding),
+                payload,
+                ex=86400,  # 24-hour cache expiration
+                nx=True,
             )
         except Exception as e:
             logger.warning(f"Cache storage error for key {cache_key[:16]}...: {e}")
 
+    async def _flush_cache_writes(self) -> None:
+        """Background task: write queued cache entries to Redis in batched pipelines."""
+        queue = self._cache_write_queue
+        while True:
+            items = [await queue.get()]
+            # Give writes from the same burst a moment to pile up behind the first one
+            await asyncio.sleep(CACHE_WRITE_FLUSH_INTERVAL)
+            while not queue.empty() and len(items) < CACHE_WRITE_BATCH_SIZE:
+                items.append(queue.get_nowait())
+            
+            try:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for cache_key, payload in items:
+                        pipe.set(cache_key, payload, ex=86400, nx=True)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Cache flush error for {len(items)} keys: {e}")
+            finally:
+                for _ in items:
+                    queue.task_done()
+
+    async def _get_cached_embeddings_bulk(
+        self, cache_keys: list[str]
+    ) -> list[Optional[list[float]]]:
+        """Retrieve many embeddings from cache with a single MGET round trip."""
+        # Serve what we can from the in-process LRU, then ask Redis for the rest
+        embeddings = [self._local_cache_get(cache_key) for cache_key in cache_keys]
+        missing = [j for j, embedding in enumerate(embeddings) if embedding is None]
+        self.embedding_cache_hits += len(embeddings) - len(missing)
+        
+        if not self.redis_client or not missing:
+            return embeddings
+
+        try:
+            cached_values = await self.redis_client.mget([cache_keys[j] for j in missing])
+        except Exception as e:
+            logger.warning(f"Bulk cache retrieval error for {len(missing)} keys: {e}")
+            self.embedding_cache_misses += len(missing)
+            return embeddings
+
+        hits = 0
+        for j, value in zip(missing, cached_values):
+            embedding = _decode_embedding(value) if value else None
+            if embedding:
+                embeddings[j] = embedding
+                self._local_cache_put(cache_keys[j], value)
+                hits += 1
+        self.embedding_cache_hits += hits
+        self.embedding_cache_misses += len(missing) - hits
+        return embeddings
+
+    async def _cache_embeddings_bulk(self, pairs: list[tuple[str, list[float]]]) -> None:
+        """Store many embeddings in one pipelined round trip."""
+        output_dtype = self._cache_encoding
+        payloads = [
+            (cache_key, _encode_embedding(embedding, output_dtype)) for cache_key, embedding in pairs
+        ]
+        for cache_key, payload in payloads:
+            self._local_cache_put(cache_key, payload)
+        if not self.redis_client or not pairs:
+            return
+
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for cache_key, payload in payloads:
+                    # 24-hour cache expiration; keep any value another writer already stored
+                    pipe.set(cache_key, payload, ex=86400, nx=True)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Bulk cache storage error for {len(pairs)} keys: {e}")
+
     async def embed_single(
         self,
         text: str,
@@ -148,22 +457,177 @@ class VoyageEmbedder:
         Raises:
             EmbeddingError: If embedding generation fails after all retries
         """
-        if not text or not text.strip():
+        stripped = text.strip() if text else ""
+        if not stripped:
             raise EmbeddingError("Cannot embed empty or whitespace-only text")
 
-        if len(text.strip()) > 32000:  # Voyage AI limit
+        if len(stripped) > 32000:  # Voyage AI limit
             raise EmbeddingError(f"Text too long ({len(text)} chars), maximum 32000 characters")
 
         model = model or self.config.voyage_embed_model
-        text = text.strip()
+        text = stripped
 
-        # Check cache first
+        # In-process cache first; Redis lookups are batched with calls from the same tick
         cache_key = self._generate_cache_key(text, model)
-        cached_embedding = await self._get_cached_embedding(cache_key)
-        if cached_embedding:
+        cached_embedding = self._local_cache_get(cache_key)
+        if cached_embedding is not None:
+            self.embedding_cache_hits += 1
             return cached_embedding
 
-        # Generate new embedding with comprehensive retry logic
+        # Concurrent callers share one MGET; their misses share batched API requests
+        future = asyncio.get_running_loop().create_future()
+        self._pending_single.setdefault((model, input_type), []).append((text, cache_key, future))
+        if self._single_flush_task is None:
+            self._single_flush_task = asyncio.create_task(self._flush_pending_single())
+        
+        return await future
+
+    async def _flush_pending_single(self) -> None:
+        """Look up every queued embed_single call in the cache and queue the misses for Voyage."""
+        pending, self._pending_single = self._pending_single, {}
+        self._single_flush_task = None
+        
+        queued = None
+        try:
+            queued = await self._lookup_pending_single(pending)
+        except Exception as e:
+            logger.error(f"Coalesced embedding cache lookup failed: {e}")
+            self._fail_waiters(
+                (future for requests in pending.values() for _, _, future in requests), e
+            )
+        finally:
+            # Never leave a caller parked if this task is cancelled before the lookup finishes;
+            # misses are only handed to the Voyage queue once it has
+            if queued is None:
+                for requests in pending.values():
+                    for _, _, future in requests:
+                        if not future.done():
+                            future.cancel()
+        
+        if queued and self._single_embed_task is None:
+            self._single_embed_task = asyncio.create_task(self._flush_pending_misses())
+
+    async def _lookup_pending_single(
+        self, pending: dict[tuple[str, str], list[tuple[str, str, asyncio.Future]]]
+    ) -> bool:
+        """
+        Answer queued embed_single calls from the cache in one MGET.
+        
+        Returns:
+            Whether any misses were added to the Voyage queue
+        """
+        grouped = []
+        for (model, input_type), requests in pending.items():
+            # Identical texts share a single cache lookup and API slot
+            waiters: dict[str, list[tuple[str, asyncio.Future]]] = {}
+            for text, cache_key, future in requests:
+                waiters.setdefault(text, []).append((cache_key, future))
+            grouped.append((model, input_type, waiters))
+        
+        cache_keys = [
+            text_waiters[0][0]
+            for _, _, waiters in grouped
+            for text_waiters in waiters.values()
+        ]
+        cached = iter(await self._get_cached_embeddings_bulk(cache_keys))
+        
+        queued = False
+        for model, input_type, waiters in grouped:
+            for text, text_waiters in waiters.items():
+                embedding = next(cached)
+                if embedding is None:
+                    queue = self._pending_misses.setdefault((model, input_type), {})
+                    queue.setdefault(text, []).extend(text_waiters)
+                    queued = True
+                    continue
+                for _, future in text_waiters:
+                    if not future.done():
+                        future.set_result(embedding)
+        return queued
+
+    async def _flush_pending_misses(self) -> None:
+        """Send queued cache misses to Voyage, batching with peers only while a call is in flight."""
+        # Batching only pays off when there is traffic to batch with
+        if self._single_embeds_in_flight:
+            await asyncio.sleep(SINGLE_EMBED_COALESCE_WINDOW)
+        pending, self._pending_misses = self._pending_misses, {}
+        self._single_embed_task = None
+        
+        groups = []
+        for (model, input_type), misses in pending.items():
+            texts = list(misses)
+            for i in range(0, len(texts), SINGLE_EMBED_MAX_BATCH):
+                group = {text: misses[text] for text in texts[i:i + SINGLE_EMBED_MAX_BATCH]}
+                groups.append(self._embed_pending_single(model, input_type, group))
+        
+        try:
+            await asyncio.gather(*groups)
+        except Exception as e:
+            logger.error(f"Coalesced embedding flush failed: {e}")
+            self._fail_waiters(
+                (
+                    future
+                    for misses in pending.values()
+                    for text_waiters in misses.values()
+                    for _, future in text_waiters
+                ),
+                e,
+            )
+        finally:
+            # Never leave a caller parked, even if this task is cancelled
+            for misses in pending.values():
+                for text_waiters in misses.values():
+                    for _, future in text_waiters:
+                        if not future.done():
+                            future.cancel()
+
+    @staticmethod
+    def _fail_waiters(futures: Iterable[asyncio.Future], e: Exception) -> None:
+        """Resolve every still-waiting embed_single call with an EmbeddingError."""
+        error = e if isinstance(e, EmbeddingError) else EmbeddingError(
+            f"Failed to generate embedding: {str(e)}", e
+        )
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _embed_pending_single(
+        self,
+        model: str,
+        input_type: str,
+        waiters: dict[str, list[tuple[str, asyncio.Future]]],
+    ) -> None:
+        """Embed one coalesced group and resolve each waiting embed_single call."""
+        texts = list(waiters)
+        
+        self._single_embeds_in_flight += 1
+        try:
+            embeddings = await self._embed_with_retry(texts, model, input_type)
+        except Exception as e:
+            for text_waiters in waiters.values():
+                for _, future in text_waiters:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        finally:
+            self._single_embeds_in_flight -= 1
+        
+        for text, embedding in zip(texts, embeddings):
+            text_waiters = waiters[text]
+            await self._cache_embedding(text_waiters[0][0], embedding)
+            for _, future in text_waiters:
+                if not future.done():
+                    future.set_result(embedding)
+
+    async def _embed_with_retry(
+        self, texts: list[str], model: str, input_type: str
+    ) -> list[list[float]]:
+        """
+        Call the Voyage API for a group of texts with comprehensive retry logic.
+        
+        Raises:
+            EmbeddingError: If embedding generation fails after all retries
+        """
         max_retries = 3
         base_delay = 1.0
         
@@ -171,33 +635,33 @@ class VoyageEmbedder:
             try:
                 self.total_api_calls += 1
                 
-                # Use asyncio.to_thread for sync Voyage API with timeout
                 async with asyncio.timeout(30.0):  # 30-second timeout
-                    result = await asyncio.to_thread(
-                        self.client.embed,
-                        texts=[text],
+                    result = await self.client.embed(
+                        texts=texts,
                         model=model,
                         input_type=input_type,
+                        **self._embed_options(),
                     )
                 
-                if not result or not result.embeddings or not result.embeddings[0]:
+                if (
+                    not result
+                    or not result.embeddings
+                    or len(result.embeddings) != len(texts)
+                    or not all(result.embeddings)
+                ):
                     raise EmbeddingError("Empty response from Voyage AI API")
                 
-                embedding = result.embeddings[0]
+                embeddings = result.embeddings
                 
                 # Validate embedding dimensions
-                if len(embedding) != self.config.embedding_dimension:
+                if len(embeddings[0]) != self.config.embedding_dimension:
                     logger.warning(
-                        f"Unexpected embedding dimension: {len(embedding)}, "
+                        f"Unexpected embedding dimension: {len(embeddings[0])}, "
                         f"expected {self.config.embedding_dimension}"
                     )
                 
-                self.total_embeddings_generated += 1
-
-                # Cache the result
-                await self._cache_embedding(cache_key, embedding)
-                
-                return embedding
+                self.total_embeddings_generated += len(embeddings)
+                return embeddings
 
             except asyncio.TimeoutError:
                 self.total_api_errors += 1
@@ -248,83 +712,92 @@ class VoyageEmbedder:
         # Clean and validate texts
         cleaned_texts = []
         valid_indices = []
+        skipped_indices = []
         
         for i, text in enumerate(texts):
-            if text and text.strip() and len(text.strip()) <= 32000:
-                cleaned_texts.append(text.strip())
+            stripped = text.strip() if text else ""
+            if stripped and len(stripped) <= 32000:
+                cleaned_texts.append(stripped)
                 valid_indices.append(i)
             else:
-                logger.warning(f"Skipping invalid text at index {i}: empty or too long")
+                skipped_indices.append(i)
+        
+        if skipped_indices:
+            logger.warning(
+                f"Skipping {len(skipped_indices)} invalid texts (empty or too long) "
+                f"at indices {skipped_indices[:10]}"
+            )
         
         if not cleaned_texts:
             return [[] for _ in texts]  # Return empty embeddings for all invalid texts
 
         embeddings_result = [[] for _ in texts]
         
-        # Process in batches to respect API limits
-        for i in range(0, len(cleaned_texts), batch_size):
-            batch_texts = cleaned_texts[i:i + batch_size]
-            batch_indices = valid_indices[i:i + batch_size]
-            
-            # Check cache for each text in batch
-            batch_embeddings = []
-            uncached_texts = []
-            uncached_positions = []
-            
-            for j, text in enumerate(batch_texts):
-                cache_key = self._generate_cache_key(text, model)
-                cached_embedding = await self._get_cached_embedding(cache_key)
+        # Embed each distinct text once; duplicates share the result
+        unique_index: dict[str, int] = {}
+        position_map = [unique_index.setdefault(text, len(unique_index)) for text in cleaned_texts]
+        unique_texts = list(unique_index)
+        unique_embeddings: list[list[float]] = [[] for _ in unique_texts]
+        cache_keys = self._generate_cache_keys(unique_texts, model)
+        
+        # Check cache for every distinct text in one round trip
+        cached_embeddings = await self._get_cached_embeddings_bulk(cache_keys)
+        uncached_positions = []
+        for j, embedding in enumerate(cached_embeddings):
+            if embedding:
+                unique_embeddings[j] = embedding
+            else:
+                uncached_positions.append(j)
+        
+        # Pack the misses into API-sized batches (item and token limits) and send them concurrently
+        sub_batches = _pack_token_batches(unique_texts, uncached_positions, batch_size)
+        semaphore = asyncio.Semaphore(max(1, self.config.embed_concurrency))
+        
+        async def embed_sub_batch(positions: list[int]) -> list[Optional[list[float]]]:
+            async with semaphore:
+                self.total_api_calls += 1
+                async with asyncio.timeout(60.0):  # Longer timeout for batch
+                    result = await self.client.embed(
+                        texts=[unique_texts[pos] for pos in positions],
+                        model=model,
+                        input_type=input_type,
+                        **self._embed_options(),
+                    )
                 
-                if cached_embedding:
-                    batch_embeddings.append(cached_embedding)
-                else:
-                    batch_embeddings.append(None)
-                    uncached_texts.append(text)
-                    uncached_positions.append(j)
-            
-            # Generate embeddings for uncached texts
-            if uncached_texts:
-                try:
-                    self.total_api_calls += 1
-                    
-                    async with asyncio.timeout(60.0):  # Longer timeout for batch
-                        result = await asyncio.to_thread(
-                            self.client.embed,
-                            texts=uncached_texts,
-                            model=model,
-                            input_type=input_type,
-                        )
-                    
-                    if not result or not result.embeddings:
-                        raise EmbeddingError("Empty batch response from Voyage AI API")
-                    
-                    # Insert results back into batch
-                    for pos_idx, embedding in zip(uncached_positions, result.embeddings):
-                        if embedding:
-                            batch_embeddings[pos_idx] = embedding
-                            self.total_embeddings_generated += 1
-                            
-                            # Cache individual embedding
-                            text_for_caching = uncached_texts[uncached_positions.index(pos_idx)]
-                            cache_key = self._generate_cache_key(text_for_caching, model)
-                            await self._cache_embedding(cache_key, embedding)
-                        else:
-                            # Use zero vector as fallback
-                            batch_embeddings[pos_idx] = [0.0] * self.config.embedding_dimension
-                            
-                except Exception as e:
-                    self.total_api_errors += 1
-                    logger.error(f"Batch embedding failed for batch starting at {i}: {e}")
-                    
-                    # Fill failed embeddings with zero vectors
-                    for pos_idx in uncached_positions:
-                        if batch_embeddings[pos_idx] is None:
-                            batch_embeddings[pos_idx] = [0.0] * self.config.embedding_dimension
+                if not result or not result.embeddings:
+                    raise EmbeddingError("Empty batch response from Voyage AI API")
+                return result.embeddings
+        
+        batch_results = await asyncio.gather(
+            *(embed_sub_batch(positions) for positions in sub_batches),
+            return_exceptions=True,
+        )
+        
+        # Stitch results back in one pass; failed batches fall back to zero vectors
+        to_cache = []
+        for positions, batch_result in zip(sub_batches, batch_results):
+            if isinstance(batch_result, BaseException):
+                self.total_api_errors += 1
+                logger.error(f"Batch embedding failed for {len(positions)} texts: {batch_result}")
+                batch_result = []
             
-            # Insert batch results into final result array
-            for j, original_idx in enumerate(batch_indices):
-                if j < len(batch_embeddings) and batch_embeddings[j]:
-                    embeddings_result[original_idx] = batch_embeddings[j]
+            batch_embeddings = list(batch_result)
+            for k, pos in enumerate(positions):
+                embedding = batch_embeddings[k] if k < len(batch_embeddings) else None
+                if embedding:
+                    unique_embeddings[pos] = embedding
+                    self.total_embeddings_generated += 1
+                    to_cache.append((cache_keys[pos], embedding))
+                else:
+                    # Use zero vector as fallback
+                    unique_embeddings[pos] = [0.0] * self.config.embedding_dimension
+        
+        # Cache all new embeddings in one pipelined write
+        await self._cache_embeddings_bulk(to_cache)
+
+        # Fan results back out to every original position, including duplicates
+        for original_idx, unique_idx in zip(valid_indices, position_map):
+            embeddings_result[original_idx] = unique_embeddings[unique_idx]
 
         return embeddings_result
 
@@ -350,23 +823,11 @@ class VoyageEmbedder:
             texts = [doc.page_content for doc in documents]
             embeddings = await self.embed_batch(texts, model=model, input_type="document")
             
-            # Add embeddings to document metadata with comprehensive tracking
-            enhanced_documents = []
-            for i, (doc, embedding) in enumerate(zip(documents, embeddings)):
-                # Create new document to avoid modifying original
-                enhanced_doc = Document(
-                    page_content=doc.page_content,
-                    metadata={
-                        **doc.metadata,
-                        "embedding": embedding,
-                        "embedding_model": model or self.config.voyage_embed_model,
-                        "embedding_timestamp": int(time.time()),
-                        "embedding_version": "v1.0",
-                        "text_length": len(doc.page_content),
-                        "embedding_dimension": len(embedding) if embedding else 0,
-                    }
-                )
-                enhanced_documents.append(enhanced_doc)
+            base_metadata = self._embedding_base_metadata(model)
+            enhanced_documents = [
+                self._embedded_document(doc, embedding, base_metadata)
+                for doc, embedding in zip(documents, embeddings)
+            ]
             
             logger.info(f"Successfully embedded {len(enhanced_documents)} documents")
             return enhanced_documents
@@ -375,6 +836,72 @@ class VoyageEmbedder:
             logger.error(f"Document embedding failed: {e}")
             raise EmbeddingError(f"Failed to embed documents: {str(e)}", e)
 
+    async def embed_documents_iter(
+        self,
+        documents: Iterable[Document],
+        model: Optional[str] = None,
+        batch_size: int = 128,
+    ) -> AsyncIterator[Document]:
+        """
+        Embed a stream of documents batch by batch, yielding them as they are ready.
+        
+        Only one batch of documents is held at a time, so this pairs with
+        iter_split_documents to embed very large inputs in bounded memory.
+        
+        Args:
+            documents: Iterable of LangChain Document objects
+            model: Voyage model to use
+            batch_size: Documents read from the iterable per embed_batch call
+            
+        Yields:
+            Documents with embedding metadata added, in input order
+        """
+        iterator = iter(documents)
+        embedded_count = 0
+        
+        while batch := list(itertools.islice(iterator, batch_size)):
+            try:
+                embeddings = await self.embed_batch(
+                    [doc.page_content for doc in batch],
+                    model=model,
+                    input_type="document",
+                    batch_size=batch_size,
+                )
+            except Exception as e:
+                logger.error(f"Document embedding failed: {e}")
+                raise EmbeddingError(f"Failed to embed documents: {str(e)}", e)
+            
+            base_metadata = self._embedding_base_metadata(model)
+            for doc, embedding in zip(batch, embeddings):
+                yield self._embedded_document(doc, embedding, base_metadata)
+            embedded_count += len(batch)
+        
+        logger.info(f"Successfully embedded {embedded_count} documents")
+
+    def _embedding_base_metadata(self, model: Optional[str]) -> dict[str, Any]:
+        """Metadata shared by every document embedded in one call."""
+        return {
+            "embedding_model": model or self.config.voyage_embed_model,
+            "embedding_timestamp": int(time.time()),
+            "embedding_version": "v1.0",
+        }
+
+    @staticmethod
+    def _embedded_document(
+        doc: Document, embedding: list[float], base_metadata: dict[str, Any]
+    ) -> Document:
+        """Create a new document carrying its embedding, leaving the original untouched."""
+        return Document(
+            page_content=doc.page_content,
+            metadata={
+                **doc.metadata,
+                **base_metadata,
+                "embedding": embedding,
+                "text_length": len(doc.page_content),
+                "embedding_dimension": len(embedding) if embedding else 0,
+            }
+        )
+
     def split_documents(self, documents: list[Document]) -> list[Document]:
         """
         Split documents into chunks with comprehensive metadata tracking.
@@ -389,27 +916,36 @@ class VoyageEmbedder:
             return []
 
         try:
-            chunks = self.text_splitter.split_documents(documents)
+            enhanced_chunks = list(self._annotate_chunks(self._iter_raw_chunks(documents)))
             
-            # Add comprehensive chunk metadata
-            enhanced_chunks = []
-            for i, chunk in enumerate(chunks):
-                enhanced_chunk = Document(
-                    page_content=chunk.page_content,
-                    metadata={
-                        **chunk.metadata,
-                        "chunk_index": i,
-                        "chunk_size": len(chunk.page_content),
-                        "chunk_id": f"chunk_{i}_{hash(chunk.page_content) % 1000000}",
-                        "splitter_config": {
-                            "chunk_size": self.config.chunk_size,
-                            "chunk_overlap": self.config.chunk_overlap,
-                            "separator_count": len(self.text_splitter.separators),
-                        },
-                        "split_timestamp": int(time.time()),
-                    }
-                )
-                enhanced_chunks.append(enhanced_chunk)
+            logger.info(f"Split {len(documents)} documents into {len(enhanced_chunks)} chunks")
+            return enhanced_chunks
+            
+        except Exception as e:
+            logger.error(f"Document splitting failed: {e}")
+            # Return original documents as fallback
+            logger.warning("Returning original documents due to splitting failure")
+            return documents
+
+    async def split_documents_async(self, documents: list[Document]) -> list[Document]:
+        """
+        Split documents like split_documents without blocking the event loop.
+        
+        Large document sets are split across worker processes; smaller ones
+        are split inline, where pickling them to a worker would cost more.
+        
+        Args:
+            documents: List of documents to split
+            
+        Returns:
+            List of document chunks with enhanced metadata
+        """
+        if len(documents) < PARALLEL_SPLIT_MIN_DOCUMENTS or SPLIT_WORKERS == 1:
+            return self.split_documents(documents)
+
+        try:
+            chunks = await self._split_documents_parallel(documents)
+            enhanced_chunks = list(self._annotate_chunks(chunks))
             
             logger.info(f"Split {len(documents)} documents into {len(enhanced_chunks)} chunks")
             return enhanced_chunks
@@ -420,6 +956,79 @@ class VoyageEmbedder:
             logger.warning("Returning original documents due to splitting failure")
             return documents
 
+    def iter_split_documents(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """
+        Lazily split documents, yielding one annotated chunk at a time.
+        
+        Unlike split_documents, chunks are never all materialized, and
+        splitting errors propagate to the caller instead of falling back.
+        
+        Args:
+            documents: Iterable of documents to split
+            
+        Yields:
+            Document chunks with the same metadata split_documents adds
+        """
+        return self._annotate_chunks(self._iter_raw_chunks(documents))
+
+    def _iter_raw_chunks(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """Split one document at a time, carrying its metadata onto each chunk."""
+        for doc in documents:
+            for text in self.text_splitter.split_text(doc.page_content):
+                yield Document(page_content=text, metadata=dict(doc.metadata))
+
+    def _annotate_chunks(self, chunks: Iterable[Document]) -> Iterator[Document]:
+        """Attach chunk index, size, stable id and splitter settings to each chunk."""
+        # Metadata shared by every chunk in this call
+        base_metadata = {
+            "splitter_config": {
+                "chunk_size": self.config.chunk_size,
+                "chunk_overlap": self.config.chunk_overlap,
+                "separator_count": len(TEXT_SEPARATORS),
+            },
+            "split_timestamp": int(time.time()),
+        }
+        
+        for i, chunk in enumerate(chunks):
+            yield Document(
+                page_content=chunk.page_content,
+                metadata={
+                    **chunk.metadata,
+                    **base_metadata,
+                    "chunk_index": i,
+                    "chunk_size": len(chunk.page_content),
+                    # Stable across processes and runs, unlike the salted builtin hash()
+                    "chunk_id": f"chunk_{i}_{xxhash.xxh3_64_intdigest(chunk.page_content.encode('utf-8')):016x}",
+                }
+            )
+
+    async def _split_documents_parallel(self, documents: list[Document]) -> list[Document]:
+        """Split contiguous document slices across worker processes, preserving order."""
+        if self._split_executor is None:
+            # Spawned, not forked: this process already runs exporter threads and the event loop
+            self._split_executor = ProcessPoolExecutor(
+                max_workers=SPLIT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        
+        slice_size = -(-len(documents) // SPLIT_WORKERS)
+        slices = [documents[i:i + slice_size] for i in range(0, len(documents), slice_size)]
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(
+                self._split_executor,
+                partial(
+                    _split_document_slice,
+                    self.config.chunk_size,
+                    self.config.chunk_overlap,
+                    TEXT_SEPARATORS,
+                    document_slice,
+                ),
+            )
+            for document_slice in slices
+        ))
+        return list(itertools.chain.from_iterable(results))
+
     def get_stats(self) -> dict[str, Any]:
         """Get comprehensive embedding service statistics for monitoring."""
         cache_hit_rate = 0.0
@@ -443,6 +1052,7 @@ class VoyageEmbedder:
             "model": self.config.voyage_embed_model,
             "embedding_dimension": self.config.embedding_dimension,
             "cache_available": self.redis_client is not None,
+            "local_cache_entries": len(self._local_cache),
         }
 
     async def health_check(self) -> dict[str, Any]:
@@ -4,16 +4,20 @@ Handles real-time document updates, DMS synchronization, and system events.
 """
 
 import asyncio
-import json
 import logging
+import os
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
-from uuid import uuid4
 
 import aiokafka
-from aiokafka import AIOKafkaProducer, AIOKafkaConsumer
+import orjson
+from aiokafka import AIOKafkaProducer, AIOKafkaConsumer, ConsumerRebalanceListener
+from aiokafka.errors import CommitFailedError, IllegalStateError
 from pydantic import BaseModel
 
 from src.config import get_config
@@ -21,6 +25,68 @@ from src.config import get_config
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def _encode_key(key: str) -> bytes:
+    """Encode a partition key; tenant ids repeat, so the bytes are cached."""
+    return key.encode('utf-8')
+
+
+def _json_default(value: Any) -> Any:
+    """Fallback for values orjson cannot encode natively, such as models nested in payloads."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode='json')
+    return str(value)
+
+
+def _serialize_event(value: Dict[str, Any]) -> bytes:
+    """Serialize an event dict straight to bytes; datetimes and enums are handled natively."""
+    return orjson.dumps(value, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+# Event ids are UUIDv7: time-ordered, so ids in one Kafka batch share a prefix that compresses
+# well. Random bits are drawn from a pooled os.urandom buffer instead of one syscall per event.
+_EVENT_ID_RANDOM_BYTES = 10
+_EVENT_ID_POOL_SIZE = 1024
+_event_id_lock = threading.Lock()
+_event_id_entropy = b""
+_event_id_offset = 0
+
+
+def _reset_event_id_pool() -> None:
+    """Discard the pooled entropy in a forked child so it never reuses the parent's bytes."""
+    global _event_id_lock, _event_id_entropy, _event_id_offset
+    # Another thread may have held the lock at fork time
+    _event_id_lock = threading.Lock()
+    _event_id_entropy = b""
+    _event_id_offset = 0
+
+
+os.register_at_fork(after_in_child=_reset_event_id_pool)
+
+
+def _new_event_id() -> str:
+    """Generate a UUIDv7 string (48-bit ms timestamp, version 7, RFC 4122 variant, 74 random bits)."""
+    global _event_id_entropy, _event_id_offset
+    with _event_id_lock:
+        if _event_id_offset >= len(_event_id_entropy):
+            _event_id_entropy = os.urandom(_EVENT_ID_RANDOM_BYTES * _EVENT_ID_POOL_SIZE)
+            _event_id_offset = 0
+        start = _event_id_offset
+        _event_id_offset += _EVENT_ID_RANDOM_BYTES
+        rand = int.from_bytes(_event_id_entropy[start:_event_id_offset], "big")
+    
+    unix_ms = time.time_ns() // 1_000_000
+    value = (
+        (unix_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76
+        | ((rand >> 62) & 0xFFF) << 64
+        | 0b10 << 62
+        | rand & ((1 << 62) - 1)
+    )
+    h = f"{value:032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
 class EventType(str, Enum):
     """Types of events in the system."""
     DOCUMENT_INGESTED = "document.ingested"
@@ -48,7 +114,7 @@ class Event(BaseModel):
 
     def __init__(self, **data):
         if not data.get('event_id'):
-            data['event_id'] = str(uuid4())
+            data['event_id'] = _new_event_id()
         if not data.get('timestamp'):
             data['timestamp'] = datetime.now()
         super().__init__(**data)
@@ -116,17 +182,20 @@ class EventProducer:
         try:
             self.producer = AIOKafkaProducer(
                 bootstrap_servers=self.kafka_servers,
-                value_serializer=lambda v: json.dumps(v, default=str).encode('utf-8'),
-                compression_type="snappy",  # Fast compression
-                batch_size=16384,  # 16KB batches
-                linger_ms=10,  # 10ms batching window
+                value_serializer=_serialize_event,
+                # zstd (level 3, the broker default) compresses JSON events well at snappy-like CPU cost
+                compression_type=self.config.kafka_compression_type,
+                # Larger batches and a longer linger amortize per-request overhead; a batch
+                # still goes out as soon as it is full, so busy producers add little latency
+                max_batch_size=self.config.kafka_batch_size,
+                linger_ms=self.config.kafka_linger_ms,
                 max_request_size=1048576,  # 1MB max message size
-                retries=5,
+                # aiokafka retries failed sends internally until request_timeout_ms elapses
                 retry_backoff_ms=100,
                 request_timeout_ms=30000,
                 acks='all',  # Wait for all replicas
+                # Idempotence keeps per-partition ordering without capping in-flight requests
                 enable_idempotence=True,  # Prevent duplicates
-                max_in_flight_requests_per_connection=1,  # Preserve order
             )
             
             await self.producer.start()
@@ -140,34 +209,50 @@ class EventProducer:
         self,
         event: Event,
         topic_key: str = 'system',
-        partition_key: Optional[str] = None
+        partition_key: Optional[str] = None,
+        wait_for_ack: bool = False
     ) -> None:
-        """Produce event to Kafka topic."""
-        if not self.producer:
-            logger.warning("Producer not initialized, dropping event")
+        """
+        Produce event to Kafka topic.
+        
+        By default the event is handed to the producer's batch accumulator and
+        delivery failures are counted from a callback; pass wait_for_ack=True for
+        events that must be acknowledged by the brokers before returning.
+        """
+        if not self._accepting_events():
             return
         
         try:
             topic = self.topics.get(topic_key, self.topics['system'])
             
             # Use tenant_id as partition key for tenant isolation
-            key = (partition_key or event.tenant_id).encode('utf-8')
+            key = _encode_key(partition_key or event.tenant_id)
             
-            # Convert event to dict for serialization
-            event_data = event.model_dump()
+            # Validated field values are already in __dict__; orjson encodes them directly,
+            # so there is no need for a full model_dump() walk per event
+            event_data = event.__dict__
             
-            # Add routing metadata
-            event_data['_routing'] = {
-                'topic': topic,
-                'partition_key': partition_key or event.tenant_id,
-                'producer_timestamp': time.time(),
-            }
+            # Routing metadata travels in record headers, leaving the JSON body untouched;
+            # the record's own timestamp already carries the producer time
+            headers = [('topic', _encode_key(topic)), ('partition_key', key)]
             
-            await self.producer.send_and_wait(
-                topic,
-                value=event_data,
-                key=key
-            )
+            if wait_for_ack:
+                await self.producer.send_and_wait(
+                    topic,
+                    value=event_data,
+                    key=key,
+                    headers=headers
+                )
+            else:
+                delivery = await self.producer.send(
+                    topic,
+                    value=event_data,
+                    key=key,
+                    headers=headers
+                )
+                delivery.add_done_callback(
+                    lambda future, event_id=event.event_id: self._on_delivery(event_id, future)
+                )
             
             self.events_produced += 1
             
@@ -181,6 +266,22 @@ class EventProducer:
             # Optionally store failed events for retry
             await self._store_failed_event(event, str(e))
 
+    def _accepting_events(self) -> bool:
+        """Check skip conditions before any event construction or serialization work."""
+        if not self.producer:
+            logger.warning("Producer not initialized, dropping event")
+            return False
+        return True
+
+    def _on_delivery(self, event_id: str, future: asyncio.Future) -> None:
+        """Record delivery failures of events sent without waiting for acknowledgement."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self.production_errors += 1
+            logger.error(f"Failed to deliver event {event_id}: {error}")
+
     async def produce_document_event(
         self,
         event_type: EventType,
@@ -189,6 +290,9 @@ class EventProducer:
         **kwargs
     ) -> None:
         """Produce document-related event."""
+        if not self._accepting_events():
+            return
+        
         event = DocumentEvent(
             event_type=event_type,
             tenant_id=tenant_id,
@@ -197,7 +301,12 @@ class EventProducer:
             **kwargs
         )
         
-        await self.produce_event(event, topic_key='documents')
+        # Ingestion events drive downstream indexing, so wait for the brokers to acknowledge them
+        await self.produce_event(
+            event,
+            topic_key='documents',
+            wait_for_ack=event_type == EventType.DOCUMENT_INGESTED
+        )
 
     async def produce_query_event(
         self,
@@ -208,6 +317,9 @@ class EventProducer:
         **kwargs
     ) -> None:
         """Produce query execution event."""
+        if not self._accepting_events():
+            return
+        
         event = QueryEvent(
             tenant_id=tenant_id,
             query=query,
@@ -228,6 +340,9 @@ class EventProducer:
         **kwargs
     ) -> None:
         """Produce audit trail event."""
+        if not self._accepting_events():
+            return
+        
         event = Event(
             event_type=EventType.AUDIT_LOG,
             tenant_id=tenant_id,
@@ -240,7 +355,8 @@ class EventProducer:
             }
         )
         
-        await self.produce_event(event, topic_key='audit')
+        # Audit trail must be durable before the caller moves on
+        await self.produce_event(event, topic_key='audit', wait_for_ack=True)
 
     async def close(self) -> None:
         """Close producer and cleanup resources."""
@@ -257,10 +373,13 @@ class EventProducer:
 class EventConsumer:
     """High-performance Kafka event consumer with parallel processing."""
     
-    def __init__(self, consumer_group: str, topics: List[str]):
+    def __init__(self, consumer_group: str, topics: List[str], trusted: bool = False):
         self.config = get_config()
         self.consumer_group = consumer_group
         self.topics = topics
+        # Opt in only when every topic is written by EventProducer, which already
+        # validated each event; anything else is validated on receipt
+        self.trusted = trusted
         self.consumer: Optional[AIOKafkaConsumer] = None
         self.kafka_servers = [
             "kafka-0.kafka.dealership-rag.svc.cluster.local:9092",
@@ -271,22 +390,38 @@ class EventConsumer:
         # Processing stats
         self.events_processed = 0
         self.processing_errors = 0
-        self.processing_tasks: Set[asyncio.Task] = set()
+        self.processing_tasks: set[asyncio.Task] = set()
+        
+        # Bounded concurrent processing; a slot is released when its task finishes
+        self.max_concurrent_processing = 100
+        self._processing_slots = asyncio.Semaphore(self.max_concurrent_processing)
+        
+        # Offsets are committed in batches: every commit_interval_seconds, or sooner once
+        # commit_batch_size messages are ready. Messages finish out of order, so per partition
+        # we track dispatched offsets and only commit past the contiguous run that has finished.
+        self.commit_interval_seconds = 1.0
+        self.commit_batch_size = 500
+        self._pending_offsets: Dict[Any, OrderedDict[int, bool]] = {}
+        self._commit_offsets: Dict[Any, int] = {}
+        self._uncommitted_count = 0
+        self._commit_requested = asyncio.Event()
+        self._commit_task: Optional[asyncio.Task] = None
 
     async def initialize(self) -> None:
         """Initialize Kafka consumer."""
         try:
             self.consumer = AIOKafkaConsumer(
-                *self.topics,
                 bootstrap_servers=self.kafka_servers,
                 group_id=self.consumer_group,
-                value_deserializer=lambda m: json.loads(m.decode('utf-8')),
+                value_deserializer=orjson.loads,
                 auto_offset_reset='earliest',
                 enable_auto_commit=False,  # Manual commit for reliability
                 max_poll_records=500,  # Batch processing
                 fetch_max_bytes=52428800,  # 50MB max fetch
                 consumer_timeout_ms=1000,
             )
+            # Commit finished work and drop tracking for partitions handed to another member
+            self.consumer.subscribe(self.topics, listener=_CommitOnRevokeListener(self))
             
             await self.consumer.start()
             logger.info(f"Kafka consumer initialized for group {self.consumer_group}")
@@ -301,28 +436,22 @@ class EventConsumer:
             await self.initialize()
         
         logger.info(f"Starting consumer for topics: {self.topics}")
+        self._commit_task = asyncio.create_task(self._commit_loop())
         
         try:
             async for message in self.consumer:
+                # Limit concurrent processing: wait for a free slot before taking the message on
+                await self._processing_slots.acquire()
+                
+                pending = self._pending_offsets.setdefault(message.topic_partition, OrderedDict())
+                pending[message.offset] = False
+                
                 # Create processing task
                 task = asyncio.create_task(
                     self._process_message(message, processor_func)
                 )
                 self.processing_tasks.add(task)
-                
-                # Clean up completed tasks
-                self.processing_tasks = {
-                    task for task in self.processing_tasks 
-                    if not task.done()
-                }
-                
-                # Limit concurrent processing
-                if len(self.processing_tasks) >= 100:
-                    done, pending = await asyncio.wait(
-                        self.processing_tasks,
-                        return_when=asyncio.FIRST_COMPLETED
-                    )
-                    self.processing_tasks = pending
+                task.add_done_callback(self._on_processing_done)
                 
         except Exception as e:
             logger.error(f"Consumer error: {e}")
@@ -330,21 +459,24 @@ class EventConsumer:
         finally:
             # Wait for all processing to complete
             if self.processing_tasks:
-                await asyncio.wait(self.processing_tasks)
+                await asyncio.wait(set(self.processing_tasks))
+            await self._stop_commit_loop()
+
+    def _on_processing_done(self, task: asyncio.Task) -> None:
+        """Forget a finished processing task and free its concurrency slot."""
+        self.processing_tasks.discard(task)
+        self._processing_slots.release()
 
     async def _process_message(self, message, processor_func) -> None:
         """Process individual message with error handling."""
         try:
-            event_data = message.value
-            event = Event(**event_data)
+            event = self._build_event(message.value)
             
             # Process the event
             await processor_func(event)
             
-            # Commit offset after successful processing
-            await self.consumer.commit({
-                message.topic_partition: message.offset + 1
-            })
+            # Offset becomes committable after successful processing; the commit loop batches it
+            self._mark_offset_done(message.topic_partition, message.offset)
             
             self.events_processed += 1
             
@@ -357,6 +489,111 @@ class EventConsumer:
             
             # Optionally send to dead letter queue
             await self._handle_processing_error(message, e)
+            
+            # Handed off to error handling; don't hold back commits for the rest of the partition
+            self._mark_offset_done(message.topic_partition, message.offset)
+
+    def _build_event(self, event_data: Dict[str, Any]) -> Event:
+        """Rebuild an Event from a decoded message, skipping validation for trusted topics."""
+        if not self.trusted:
+            return Event(**event_data)
+        
+        # Only restore the types that JSON flattened; everything else is already as produced.
+        # Anything not shaped like EventProducer output goes through full validation instead.
+        try:
+            fields = {
+                **event_data,
+                'event_type': EventType(event_data['event_type']),
+                'timestamp': datetime.fromisoformat(event_data['timestamp']),
+            }
+        except (KeyError, TypeError, ValueError):
+            return Event(**event_data)
+        return Event.model_construct(**fields)
+
+    def _mark_offset_done(self, topic_partition: Any, offset: int) -> None:
+        """Record a handled offset and advance the partition's committable position."""
+        pending = self._pending_offsets.get(topic_partition)
+        if pending is None or offset not in pending:
+            return
+        pending[offset] = True
+        
+        while pending:
+            first_offset, done = next(iter(pending.items()))
+            if not done:
+                break
+            pending.popitem(last=False)
+            self._commit_offsets[topic_partition] = first_offset + 1
+            self._uncommitted_count += 1
+        
+        if self._uncommitted_count >= self.commit_batch_size:
+            self._commit_requested.set()
+
+    async def _commit_loop(self) -> None:
+        """Background task: commit ready offsets on an interval or when enough pile up."""
+        while True:
+            try:
+                await asyncio.wait_for(self._commit_requested.wait(), self.commit_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            await self._commit_ready_offsets()
+
+    async def _commit_ready_offsets(self, partitions: Optional[set] = None) -> None:
+        """Commit offsets that are ready (all, or only the given partitions) in a single request."""
+        if partitions is None:
+            self._commit_requested.clear()
+        if not self._commit_offsets or not self.consumer:
+            return
+        
+        if partitions is None:
+            offsets, self._commit_offsets = self._commit_offsets, {}
+            self._uncommitted_count = 0
+        else:
+            offsets = {
+                topic_partition: self._commit_offsets.pop(topic_partition)
+                for topic_partition in partitions
+                if topic_partition in self._commit_offsets
+            }
+        
+        # Committing a partition we no longer own fails the whole request
+        assigned = self.consumer.assignment()
+        offsets = {tp: offset for tp, offset in offsets.items() if tp in assigned}
+        if not offsets:
+            return
+        
+        try:
+            await self.consumer.commit(offsets)
+        except (CommitFailedError, IllegalStateError) as e:
+            # The assignment changed under us; the new owner resumes from the last commit
+            logger.warning(f"Dropping offsets for {len(offsets)} partitions after rebalance: {e}")
+        except Exception as e:
+            logger.warning(f"Offset commit failed for {len(offsets)} partitions: {e}")
+            # Keep them for the next attempt unless newer offsets are already waiting
+            assigned = self.consumer.assignment()
+            for topic_partition, offset in offsets.items():
+                if topic_partition not in assigned:
+                    continue
+                if offset > self._commit_offsets.get(topic_partition, -1):
+                    self._commit_offsets[topic_partition] = offset
+    
+    async def _on_partitions_revoked(self, revoked) -> None:
+        """Commit what has finished on revoked partitions, then stop tracking them."""
+        revoked = set(revoked)
+        await self._commit_ready_offsets(revoked)
+        for topic_partition in revoked:
+            self._commit_offsets.pop(topic_partition, None)
+            # Tasks still running for these offsets find no entry and are ignored
+            self._pending_offsets.pop(topic_partition, None)
+
+    async def _stop_commit_loop(self) -> None:
+        """Stop the background commit task and flush whatever is ready."""
+        if self._commit_task:
+            self._commit_task.cancel()
+            try:
+                await self._commit_task
+            except asyncio.CancelledError:
+                pass
+            self._commit_task = None
+        await self._commit_ready_offsets()
 
     async def _handle_processing_error(self, message, error: Exception) -> None:
         """Handle processing errors with retry logic."""
@@ -369,13 +606,27 @@ class EventConsumer:
     async def close(self) -> None:
         """Close consumer and cleanup."""
         if self.processing_tasks:
-            await asyncio.wait(self.processing_tasks)
+            await asyncio.wait(set(self.processing_tasks))
+        await self._stop_commit_loop()
         
         if self.consumer:
             await self.consumer.stop()
             logger.info(f"Consumer closed. Stats: {self.events_processed} processed, {self.processing_errors} errors")
 
 
+class _CommitOnRevokeListener(ConsumerRebalanceListener):
+    """Rebalance hook that lets an EventConsumer settle offsets before losing partitions."""
+    
+    def __init__(self, event_consumer: EventConsumer):
+        self.event_consumer = event_consumer
+    
+    async def on_partitions_revoked(self, revoked) -> None:
+        await self.event_consumer._on_partitions_revoked(revoked)
+    
+    async def on_partitions_assigned(self, assigned) -> None:
+        pass
+
+
 # Global producer instance
 event_producer = EventProducer()
 
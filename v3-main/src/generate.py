@@ -16,6 +16,12 @@ from .config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Divider between conversation, context and question sections of the user message
+_SECTION_DIVIDER = "\n" + "=" * 50 + "\n"
+
+# Document metadata fields exposed in source attributions
+_SOURCE_METADATA_KEYS = ("chunk_index", "timestamp", "search_type", "final_rank")
+
 
 class GenerationError(Exception):
     """Custom exception for generation-related errors."""
@@ -68,22 +74,15 @@ If you cannot answer a question based on the provided context, suggest how the c
         if not documents:
             return "No relevant context found."
 
-        context_parts = []
-        
-        for i, doc in enumerate(documents, 1):
-            # Extract source information
-            source = doc.metadata.get("source", "Unknown")
-            score = doc.metadata.get("rerank_score") or doc.metadata.get("vector_score", 0)
-            
-            # Format document
-            context_part = f"""[Document {i}]
-Source: {source}
-Relevance Score: {score:.3f}
+        # One formatted block per document, joined in a single pass without an intermediate list
+        return "\n\n".join(
+            f"""[Document {i}]
+Source: {doc.metadata.get("source", "Unknown")}
+Relevance Score: {doc.metadata.get("rerank_score") or doc.metadata.get("vector_score", 0):.3f}
 Content: {doc.page_content.strip()}
 ---"""
-            context_parts.append(context_part)
-        
-        return "\n\n".join(context_parts)
+            for i, doc in enumerate(documents, 1)
+        )
 
     def _build_conversation_context(
         self, 
@@ -103,7 +102,10 @@ Content: {doc.page_content.strip()}
 
         context_parts = ["Previous Conversation:"]
         
-        for exchange in conversation_history[-5:]:  # Last 5 exchanges
+        # Last 5 exchanges, read in place by index rather than slicing a copy of the history
+        start = max(0, len(conversation_history) - 5)
+        for idx in range(start, len(conversation_history)):
+            exchange = conversation_history[idx]
             if "user" in exchange and "assistant" in exchange:
                 context_parts.append(f"Customer: {exchange['user']}")
                 context_parts.append(f"Assistant: {exchange['assistant']}")
@@ -133,8 +135,8 @@ Content: {doc.page_content.strip()}
                 ),
                 "content_preview": doc.page_content[:200] + "..." if len(doc.page_content) > 200 else doc.page_content,
                 "metadata": {
-                    key: value for key, value in doc.metadata.items()
-                    if key in ["chunk_index", "timestamp", "search_type", "final_rank"]
+                    key: doc.metadata[key] for key in _SOURCE_METADATA_KEYS
+                    if key in doc.metadata
                 }
             }
             sources.append(source_info)
@@ -170,20 +172,14 @@ Content: {doc.page_content.strip()}
             context_string = self._build_context_string(context_documents)
             conversation_context = self._build_conversation_context(conversation_history)
             
-            # Construct user message
-            user_message_parts = []
-            
+            # Construct user message from one template; history is prefixed only when present
+            user_message = (
+                f"Context Documents:\n\n{context_string}\n\n{_SECTION_DIVIDER}\n\n"
+                f"Customer Question: {query}\n\n"
+                "\nPlease provide a helpful and accurate response based on the context above."
+            )
             if conversation_context:
-                user_message_parts.append(conversation_context)
-                user_message_parts.append("\n" + "="*50 + "\n")
-            
-            user_message_parts.append("Context Documents:")
-            user_message_parts.append(context_string)
-            user_message_parts.append("\n" + "="*50 + "\n")
-            user_message_parts.append(f"Customer Question: {query}")
-            user_message_parts.append("\nPlease provide a helpful and accurate response based on the context above.")
-            
-            user_message = "\n\n".join(user_message_parts)
+                user_message = f"{conversation_context}\n\n{_SECTION_DIVIDER}\n\n{user_message}"
             
             # Generate response with timeout
             async with asyncio.timeout(self.config.query_timeout_seconds):
@@ -6,29 +6,40 @@ import logging
 import sys
 from typing import Any, Dict
 
+import orjson
 import structlog
 from src.config import get_config
 
 config = get_config()
 
 
+def _orjson_dumps(event_dict: Dict[str, Any], default: Any = None, **_: Any) -> str:
+    """JSONRenderer serializer: orjson encodes, decoded to str for the stdlib logger."""
+    # json.dumps accepted int/enum dict keys; orjson only does with OPT_NON_STR_KEYS
+    return orjson.dumps(event_dict, default=default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+# Processor chain is built once at import; the renderer is fixed by the environment
+LOG_PROCESSORS = [
+    structlog.stdlib.filter_by_level,
+    structlog.stdlib.add_logger_name,
+    structlog.stdlib.add_log_level,
+    structlog.stdlib.PositionalArgumentsFormatter(),
+    structlog.processors.TimeStamper(fmt="iso"),
+    structlog.processors.StackInfoRenderer(),
+    structlog.processors.format_exc_info,
+    structlog.processors.UnicodeDecoder(),
+    structlog.processors.JSONRenderer(serializer=_orjson_dumps) if config.environment == "production"
+    else structlog.dev.ConsoleRenderer(),
+]
+
+
 def configure_logging():
     """Configure structured logging for production."""
     
     # Configure structlog
     structlog.configure(
-        processors=[
-            structlog.stdlib.filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer() if config.environment == "production" 
-            else structlog.dev.ConsoleRenderer(),
-        ],
+        processors=LOG_PROCESSORS,
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         wrapper_class=structlog.stdlib.BoundLogger,
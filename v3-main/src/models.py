@@ -3,12 +3,32 @@ Pydantic models for the Dealership RAG system.
 Defines data structures for API requests, responses, and internal data.
 """
 
+import sys
+import time
 import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterator, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
+from pydantic.dataclasses import dataclass as pydantic_dataclass
+
+
+# Last whole second seen by _coarse_now() and its datetime
+_coarse_second = 0
+_coarse_value = datetime.fromtimestamp(0)
+
+
+def _coarse_now() -> datetime:
+    """Current local time truncated to the second, rebuilt at most once per second."""
+    global _coarse_second, _coarse_value
+    second = int(time.time())
+    if second != _coarse_second:
+        _coarse_value = datetime.fromtimestamp(second)
+        _coarse_second = second
+    return _coarse_value
 
 
 class QueryRequest(BaseModel):
@@ -23,7 +43,9 @@ class QueryRequest(BaseModel):
     include_sources: bool = Field(True, description="Include source documents")
 
 
-class SourceDocument(BaseModel):
+# Slotted dataclass rather than a model: a query can return hundreds of these
+@pydantic_dataclass(frozen=True, slots=True)
+class SourceDocument:
     """Represents a source document chunk."""
 
     id: str
@@ -157,13 +179,52 @@ class Vehicle(BaseModel):
     # Dealer and system metadata
     dealer_id: str = Field(..., description="Dealer identifier")
     last_updated: datetime = Field(default_factory=datetime.now, description="Last update timestamp")
+    vin_valid: bool = Field(default=True, description="Whether the VIN passed the 17-character format check")
+    
+    model_config = ConfigDict(use_enum_values=True)
+    
+    @model_validator(mode="after")
+    def _intern_features(self) -> "Vehicle":
+        """Share feature strings across vehicles; inventories repeat a few hundred values."""
+        self.features[:] = map(sys.intern, self.features)
+        return self
+
+
+@dataclass(slots=True)
+class VehicleBatch:
+    """
+    Columnar (struct-of-arrays) view over a page of inventory records.
     
-    class Config:
-        """Pydantic configuration."""
-        use_enum_values = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    Numeric columns are NumPy arrays for vectorised filtering and analytics;
+    full Vehicle objects are only built when a row is accessed.
+    """
+    
+    dealer_id: str
+    vins: List[str]
+    years: np.ndarray  # int16
+    prices: np.ndarray  # float64
+    mileage: np.ndarray  # int32
+    vin_valid: np.ndarray  # bool, False where the VIN failed the format check
+    records: List[Dict[str, Any]] = field(default_factory=list, repr=False)
+    # Called with (record, vin_valid) for the row being accessed
+    parser: Optional[Callable[[Dict[str, Any], bool], "Vehicle"]] = field(default=None, repr=False)
+    
+    def __len__(self) -> int:
+        return len(self.vins)
+    
+    def __getitem__(self, index: int) -> "Vehicle":
+        """Build the Vehicle for a single row on demand."""
+        if self.parser is None:
+            raise TypeError("VehicleBatch has no record parser attached")
+        return self.parser(self.records[index], bool(self.vin_valid[index]))
+    
+    def __iter__(self) -> Iterator["Vehicle"]:
+        for index in range(len(self.vins)):
+            yield self[index]
+    
+    def to_vehicles(self) -> List["Vehicle"]:
+        """Materialise every row as a Vehicle."""
+        return list(self)
 
 
 class AgentIntent(BaseModel):
@@ -225,7 +286,7 @@ class StandardErrorResponse(BaseModel):
     
     error: ErrorDetail
     request_id: Optional[str] = None
-    timestamp: datetime = Field(default_factory=datetime.now)
+    timestamp: datetime = Field(default_factory=_coarse_now)
     
     
 # Standard error codes
@@ -248,4 +309,9 @@ class ErrorCodes:
     # Business Logic
     QUERY_PROCESSING_FAILED = "BIZ_001"
     DOCUMENT_INGESTION_FAILED = "BIZ_002"
-    DMS_INTEGRATION_ERROR = "BIZ_003"
\ No newline at end of file
+    DMS_INTEGRATION_ERROR = "BIZ_003"
+
+
+# Request body adapters built once at import; routes validate raw JSON with them
+QUERY_REQUEST_ADAPTER = TypeAdapter(QueryRequest)
+INGEST_REQUEST_ADAPTER = TypeAdapter(IngestRequest)
@@ -3,22 +3,20 @@ Production OpenTelemetry setup for comprehensive observability.
 Implements distributed tracing, metrics, and logging for the Blue1 RAG system.
 """
 
+import asyncio
 import logging
 import os
 import time
-from typing import Any, Dict, Optional
+from bisect import bisect_left
+from collections import deque
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
 
 from fastapi import Request, Response
+# Exporters and instrumentors are imported where they are set up: they pull in
+# gRPC/protobuf and every instrumented library, which callers that never
+# initialise telemetry should not pay for.
 from opentelemetry import metrics, trace
-from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-from opentelemetry.exporter.prometheus import PrometheusMetricExporter
-from opentelemetry.instrumentation.asyncio import AsyncioInstrumentor
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.instrumentation.httpx import HTTPXInstrumentor
-from opentelemetry.instrumentation.logging import LoggingInstrumentor
-from opentelemetry.instrumentation.redis import RedisInstrumentor
-from opentelemetry.instrumentation.requests import RequestsInstrumentor
 from opentelemetry.sdk.metrics import MeterProvider
 from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
 from opentelemetry.sdk.resources import Resource
@@ -30,6 +28,79 @@ from src.config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Seconds between flushes of buffered record_* measurements
+METRIC_FLUSH_INTERVAL = 0.1
+# Buffered measurements kept at most; the oldest are dropped beyond this
+METRIC_BUFFER_SIZE = 100_000
+
+# HTTP status code -> metric label string
+_STATUS_STR: Dict[int, str] = {}
+
+
+class _NoopInstrument:
+    """Stand-in for a metric instrument before metrics are set up."""
+    
+    __slots__ = ()
+    
+    def add(self, amount: float, attributes: Optional[Dict[str, Any]] = None) -> None:
+        pass
+    
+    def record(self, amount: float, attributes: Optional[Dict[str, Any]] = None) -> None:
+        pass
+
+
+_NOOP_INSTRUMENT = _NoopInstrument()
+
+# Shared span handed out while tracing is off; usable as a context manager
+_NOOP_SPAN = trace.INVALID_SPAN
+
+# Span attribute values the SDK records natively
+_SPAN_ATTRIBUTE_TYPES = (str, bool, int, float)
+
+# Upper bound of each search result-count bucket; counts above the last are "50+"
+_BUCKET_EDGES = (0, 5, 10, 20, 50)
+_BUCKET_LABELS = ("0", "1-5", "6-10", "11-20", "21-50", "50+")
+
+
+@lru_cache(maxsize=32)
+def _search_labels(search_type: str, count_bucket: str) -> Dict[str, str]:
+    """Shared label dict per (search type, bucket); there are only a handful."""
+    return {"search_type": search_type, "result_count_bucket": count_bucket}
+
+
+# Endpoint label for requests that matched no route (404s, scanners)
+_UNMATCHED_ENDPOINT = "unmatched"
+
+
+def prometheus_multiproc_dir() -> Optional[str]:
+    """Shared metrics directory when prometheus_client runs in multiprocess mode."""
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.environ.get("prometheus_multiproc_dir")
+
+
+def _route_labels(request: Request) -> Dict[str, str]:
+    """
+    Method/endpoint labels for the route that handled a request.
+    
+    Uses the route template (``/vehicles/{vin}``) rather than the raw path so
+    label cardinality stays bounded. The dict is cached on the route object
+    per method, so repeat requests reuse it.
+    """
+    method = request.method
+    route = request.scope.get("route")
+    if route is None:
+        return {"method": method, "endpoint": _UNMATCHED_ENDPOINT}
+    
+    cached = getattr(route, "_otel_labels", None)
+    if cached is None:
+        cached = route._otel_labels = {}
+    labels = cached.get(method)
+    if labels is None:
+        labels = cached[method] = {
+            "method": method,
+            "endpoint": getattr(route, "path", _UNMATCHED_ENDPOINT),
+        }
+    return labels
+
 
 class TelemetryManager:
     """
@@ -49,30 +120,44 @@ class TelemetryManager:
             "telemetry.sdk.name": "opentelemetry",
         })
         
+        # gRPC metadata for the OTLP exporters, shared by traces and metrics
+        self._otlp_headers = (
+            (("authorization", f"Bearer {self.config.otlp_token}"),)
+            if self.config.otlp_token
+            else ()
+        )
+        
         # Tracer and meter instances
         self.tracer_provider: Optional[TracerProvider] = None
         self.meter_provider: Optional[MeterProvider] = None
         self.tracer = None
         self.meter = None
+        self._tracing_disabled = True
         
-        # Metrics instruments
-        self.request_counter = None
-        self.request_duration = None
-        self.active_requests = None
-        self.error_counter = None
-        self.rag_query_duration = None
-        self.rag_query_counter = None
-        self.embedding_duration = None
-        self.vector_search_duration = None
-        self.keyword_search_duration = None
-        self.dms_request_duration = None
-        self.elasticsearch_query_duration = None
+        # Metrics instruments (no-ops until _create_custom_metrics replaces them)
+        self.request_counter = _NOOP_INSTRUMENT
+        self.request_duration = _NOOP_INSTRUMENT
+        self.active_requests = _NOOP_INSTRUMENT
+        self.error_counter = _NOOP_INSTRUMENT
+        self.rag_query_duration = _NOOP_INSTRUMENT
+        self.rag_query_counter = _NOOP_INSTRUMENT
+        self.embedding_duration = _NOOP_INSTRUMENT
+        self.vector_search_duration = _NOOP_INSTRUMENT
+        self.keyword_search_duration = _NOOP_INSTRUMENT
+        self.dms_request_duration = _NOOP_INSTRUMENT
+        self.elasticsearch_query_duration = _NOOP_INSTRUMENT
         
         # Application-specific metrics
-        self.documents_indexed = None
-        self.cache_hits = None
-        self.cache_misses = None
-        self.model_inference_duration = None
+        self.documents_indexed = _NOOP_INSTRUMENT
+        self.cache_hits = _NOOP_INSTRUMENT
+        self.cache_misses = _NOOP_INSTRUMENT
+        self.model_inference_duration = _NOOP_INSTRUMENT
+        
+        # record_* measurements waiting for the flush task: (add/record, value, labels)
+        self._pending_metrics: Deque[Tuple[Callable[..., None], float, Optional[Dict[str, str]]]] = deque(
+            maxlen=METRIC_BUFFER_SIZE
+        )
+        self._metric_flush_task: Optional[asyncio.Task] = None
 
     def initialize(self) -> None:
         """Initialize OpenTelemetry with production configuration."""
@@ -81,6 +166,7 @@ class TelemetryManager:
             self._setup_metrics()
             self._setup_instrumentation()
             self._create_custom_metrics()
+            self._start_metric_flush()
             
             logger.info("OpenTelemetry telemetry initialized successfully")
             
@@ -102,10 +188,12 @@ class TelemetryManager:
             
             # Configure span processors
             if self.config.otlp_endpoint:
+                from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+                
                 # OTLP exporter for production (Jaeger, DataDog, etc.)
                 otlp_exporter = OTLPSpanExporter(
                     endpoint=self.config.otlp_endpoint,
-                    headers={"authorization": f"Bearer {self.config.otlp_token}"} if self.config.otlp_token else {},
+                    headers=self._otlp_headers,
                     insecure=not self.config.otlp_secure,
                 )
                 span_processor = BatchSpanProcessor(
@@ -124,6 +212,7 @@ class TelemetryManager:
             # Set global tracer provider
             trace.set_tracer_provider(self.tracer_provider)
             self.tracer = trace.get_tracer(__name__)
+            self._tracing_disabled = isinstance(self.tracer, trace.NoOpTracer)
             
             logger.info(f"Tracing initialized with {sampling_ratio*100}% sampling rate")
             
@@ -133,21 +222,28 @@ class TelemetryManager:
 
     def _setup_metrics(self) -> None:
         """Configure metrics collection with Prometheus and OTLP exporters."""
+        from opentelemetry.exporter.prometheus import PrometheusMetricReader
+        
         try:
-            # Prometheus exporter for metrics scraping
-            prometheus_exporter = PrometheusMetricExporter(port=8001)
-            prometheus_reader = PeriodicExportingMetricReader(
-                prometheus_exporter,
-                export_interval_millis=5000,  # 5 seconds
-            )
+            # Prometheus is a pull reader: it registers a collector with
+            # prometheus_client's default registry, which /metrics serves
+            readers = [PrometheusMetricReader()]
+            
+            if prometheus_multiproc_dir():
+                # Workers would all bind the same port; each worker's metrics are
+                # served by /metrics when that worker answers the scrape
+                logger.info("Prometheus multiprocess mode: dedicated metrics port disabled, use /metrics")
+            else:
+                self._serve_prometheus()
             
             # OTLP exporter for centralized metrics
-            readers = [prometheus_reader]
             
             if self.config.otlp_endpoint:
+                from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
+                
                 otlp_metric_exporter = OTLPMetricExporter(
                     endpoint=self.config.otlp_metrics_endpoint or self.config.otlp_endpoint,
-                    headers={"authorization": f"Bearer {self.config.otlp_token}"} if self.config.otlp_token else {},
+                    headers=self._otlp_headers,
                     insecure=not self.config.otlp_secure,
                 )
                 otlp_reader = PeriodicExportingMetricReader(
@@ -172,8 +268,24 @@ class TelemetryManager:
             logger.error(f"Failed to setup metrics: {e}")
             raise
 
+    def _serve_prometheus(self) -> None:
+        """Serve the default Prometheus registry on config.prometheus_port for scrapers."""
+        from prometheus_client import start_http_server
+        
+        port = self.config.prometheus_port
+        try:
+            start_http_server(port)
+        except OSError as e:
+            logger.error(f"Prometheus port {port} unavailable, metrics only served on /metrics: {e}")
+
     def _setup_instrumentation(self) -> None:
         """Configure automatic instrumentation for frameworks and libraries."""
+        from opentelemetry.instrumentation.asyncio import AsyncioInstrumentor
+        from opentelemetry.instrumentation.httpx import HTTPXInstrumentor
+        from opentelemetry.instrumentation.logging import LoggingInstrumentor
+        from opentelemetry.instrumentation.redis import RedisInstrumentor
+        from opentelemetry.instrumentation.requests import RequestsInstrumentor
+        
         try:
             # HTTP instrumentation
             HTTPXInstrumentor().instrument()
@@ -306,6 +418,8 @@ class TelemetryManager:
 
     def instrument_fastapi_app(self, app) -> None:
         """Instrument FastAPI application with comprehensive monitoring."""
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+        
         try:
             # FastAPI automatic instrumentation
             FastAPIInstrumentor.instrument_app(
@@ -320,9 +434,11 @@ class TelemetryManager:
             async def telemetry_middleware(request: Request, call_next):
                 start_time = time.time()
                 
+                # The route is only known after routing, so the gauge is per method
+                active_labels = {"method": request.method}
+                
                 # Increment active requests
-                if self.active_requests:
-                    self.active_requests.add(1, {"method": request.method, "endpoint": request.url.path})
+                self.active_requests.add(1, active_labels)
                 
                 try:
                     # Process request
@@ -330,34 +446,25 @@ class TelemetryManager:
                     
                     # Record metrics
                     duration = time.time() - start_time
-                    labels = {
-                        "method": request.method,
-                        "endpoint": request.url.path,
-                        "status_code": str(response.status_code),
-                    }
+                    status_code = response.status_code
+                    status_str = _STATUS_STR.get(status_code)
+                    if status_str is None:
+                        status_str = _STATUS_STR[status_code] = str(status_code)
+                    labels = {**_route_labels(request), "status_code": status_str}
                     
-                    if self.request_counter:
-                        self.request_counter.add(1, labels)
-                    
-                    if self.request_duration:
-                        self.request_duration.record(duration, labels)
+                    self.request_counter.add(1, labels)
+                    self.request_duration.record(duration, labels)
                     
                     return response
                     
                 except Exception as e:
                     # Record error
-                    if self.error_counter:
-                        self.error_counter.add(1, {
-                            "method": request.method,
-                            "endpoint": request.url.path,
-                            "error_type": type(e).__name__,
-                        })
+                    self.error_counter.add(1, {**_route_labels(request), "error_type": type(e).__name__})
                     raise
                     
                 finally:
                     # Decrement active requests
-                    if self.active_requests:
-                        self.active_requests.add(-1, {"method": request.method, "endpoint": request.url.path})
+                    self.active_requests.add(-1, active_labels)
             
             logger.info("FastAPI application instrumented successfully")
             
@@ -367,109 +474,127 @@ class TelemetryManager:
 
     def record_rag_query(self, duration: float, query_type: str, success: bool) -> None:
         """Record RAG query metrics."""
-        if not self.rag_query_duration or not self.rag_query_counter:
-            return
-        
         labels = {
             "query_type": query_type,
             "success": str(success),
         }
         
-        self.rag_query_duration.record(duration, labels)
-        self.rag_query_counter.add(1, labels)
+        self._buffer_metric(self.rag_query_duration.record, duration, labels)
+        self._buffer_metric(self.rag_query_counter.add, 1, labels)
 
     def record_embedding_operation(self, duration: float, operation: str, success: bool) -> None:
         """Record embedding operation metrics."""
-        if not self.embedding_duration:
-            return
-        
         labels = {
             "operation": operation,
             "success": str(success),
         }
         
-        self.embedding_duration.record(duration, labels)
+        self._buffer_metric(self.embedding_duration.record, duration, labels)
 
     def record_search_operation(self, duration: float, search_type: str, result_count: int) -> None:
         """Record search operation metrics."""
-        labels = {
-            "search_type": search_type,
-            "result_count_bucket": self._get_count_bucket(result_count),
-        }
+        labels = _search_labels(search_type, self._get_count_bucket(result_count))
         
-        if search_type == "vector" and self.vector_search_duration:
-            self.vector_search_duration.record(duration, labels)
-        elif search_type == "keyword" and self.keyword_search_duration:
-            self.keyword_search_duration.record(duration, labels)
-        elif search_type == "elasticsearch" and self.elasticsearch_query_duration:
-            self.elasticsearch_query_duration.record(duration, labels)
+        if search_type == "vector":
+            self._buffer_metric(self.vector_search_duration.record, duration, labels)
+        elif search_type == "keyword":
+            self._buffer_metric(self.keyword_search_duration.record, duration, labels)
+        elif search_type == "elasticsearch":
+            self._buffer_metric(self.elasticsearch_query_duration.record, duration, labels)
 
     def record_dms_operation(self, duration: float, adapter: str, operation: str, success: bool) -> None:
         """Record DMS operation metrics."""
-        if not self.dms_request_duration:
-            return
-        
         labels = {
             "adapter": adapter,
             "operation": operation,
             "success": str(success),
         }
         
-        self.dms_request_duration.record(duration, labels)
+        self._buffer_metric(self.dms_request_duration.record, duration, labels)
 
     def record_cache_operation(self, hit: bool) -> None:
         """Record cache hit/miss metrics."""
-        if hit and self.cache_hits:
-            self.cache_hits.add(1)
-        elif not hit and self.cache_misses:
-            self.cache_misses.add(1)
+        if hit:
+            self._buffer_metric(self.cache_hits.add, 1, None)
+        else:
+            self._buffer_metric(self.cache_misses.add, 1, None)
 
     def record_documents_indexed(self, count: int, namespace: str) -> None:
         """Record document indexing metrics."""
-        if self.documents_indexed:
-            self.documents_indexed.add(count, {"namespace": namespace})
+        self._buffer_metric(self.documents_indexed.add, count, {"namespace": namespace})
 
     def record_model_inference(self, duration: float, model: str, success: bool) -> None:
         """Record AI model inference metrics."""
-        if not self.model_inference_duration:
-            return
-        
         labels = {
             "model": model,
             "success": str(success),
         }
         
-        self.model_inference_duration.record(duration, labels)
+        self._buffer_metric(self.model_inference_duration.record, duration, labels)
+
+    def _buffer_metric(
+        self,
+        emit: Callable[..., None],
+        value: float,
+        labels: Optional[Dict[str, str]],
+    ) -> None:
+        """Queue a measurement for the flush task, or emit it now if none is running."""
+        if self._metric_flush_task is None:
+            emit(value, labels)
+        else:
+            self._pending_metrics.append((emit, value, labels))
+
+    def _start_metric_flush(self) -> None:
+        """Start the background flush task when initialised inside an event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Sync callers (workers, scripts) keep recording inline
+            return
+        self._metric_flush_task = loop.create_task(self._metric_flush_loop())
+
+    async def _metric_flush_loop(self) -> None:
+        """Hand buffered measurements to the SDK every METRIC_FLUSH_INTERVAL seconds."""
+        while True:
+            await asyncio.sleep(METRIC_FLUSH_INTERVAL)
+            self._flush_metrics()
+
+    def _flush_metrics(self) -> None:
+        """Emit everything buffered so far in one tight loop."""
+        pending = self._pending_metrics
+        popleft = pending.popleft
+        try:
+            for _ in range(len(pending)):
+                emit, value, labels = popleft()
+                emit(value, labels)
+        except Exception as e:
+            logger.warning(f"Failed to flush buffered metrics: {e}")
 
     def _get_count_bucket(self, count: int) -> str:
         """Get count bucket for metrics labeling."""
-        if count == 0:
-            return "0"
-        elif count <= 5:
-            return "1-5"
-        elif count <= 10:
-            return "6-10"
-        elif count <= 20:
-            return "11-20"
-        elif count <= 50:
-            return "21-50"
-        else:
-            return "50+"
+        return _BUCKET_LABELS[bisect_left(_BUCKET_EDGES, count)]
 
     def create_span(self, name: str, attributes: Optional[Dict[str, Any]] = None):
         """Create a new span for custom tracing."""
-        if not self.tracer:
-            return trace.NoOpSpan()
+        if self._tracing_disabled:
+            return _NOOP_SPAN
         
-        span = self.tracer.start_span(name)
+        # Primitives go to the SDK as-is; anything else (None, dicts, mixed lists)
+        # would be dropped with a warning, so record it as a string instead
         if attributes:
-            for key, value in attributes.items():
-                span.set_attribute(key, str(value))
-        
-        return span
+            attributes = {
+                key: value if isinstance(value, _SPAN_ATTRIBUTE_TYPES) else str(value)
+                for key, value in attributes.items()
+            }
+        return self.tracer.start_span(name, attributes=attributes)
 
     def shutdown(self) -> None:
         """Shutdown telemetry providers gracefully."""
+        if self._metric_flush_task is not None:
+            self._metric_flush_task.cancel()
+            self._metric_flush_task = None
+            self._flush_metrics()
+        
         try:
             if self.tracer_provider:
                 self.tracer_provider.shutdown()
@@ -9,14 +9,15 @@ License: Commercial use requires valid license agreement
 import asyncio
 import logging
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Optional
 
 import cohere
-import pinecone
-import redis.asyncio as redis
+import xxhash
 from langchain.schema import Document
 from pinecone import Pinecone, ServerlessSpec
-from rank_bm25 import BM25Okapi
 
 from .config import get_config
 from .embed import VoyageEmbedder, EmbeddingError
@@ -24,6 +25,80 @@ from .search.elasticsearch_retriever import ElasticsearchRetriever
 
 logger = logging.getLogger(__name__)
 
+# Keyword-result metadata copied onto a document already found by vector search
+_KEYWORD_MERGE_KEYS = frozenset(("search_type", "keyword_rank", "query_tokens"))
+
+
+# Filter keys matched exactly; "<field>_min"/"<field>_max" become range bounds on <field>
+_EQ_FILTER_KEYS = frozenset(("source", "document_id", "namespace"))
+
+
+@lru_cache(maxsize=128)
+def _compile_filter(signature: tuple[tuple[str, bool], ...]) -> tuple[tuple[str, str, str], ...]:
+    """
+    Turn a filter shape into a plan of (filter key, Pinecone field, operator).
+    
+    Args:
+        signature: (key, value is numeric) for each filter, in order
+        
+    Returns:
+        One step per filter key Pinecone understands; others are dropped
+    """
+    plan = []
+    for key, numeric in signature:
+        if key in _EQ_FILTER_KEYS:
+            plan.append((key, key, "$eq"))
+        elif numeric and key.endswith("_min"):
+            plan.append((key, key[:-4], "$gte"))
+        elif numeric and key.endswith("_max"):
+            plan.append((key, key[:-4], "$lte"))
+    return tuple(plan)
+
+
+def _pinecone_filter(filters: dict) -> Optional[dict]:
+    """Build the Pinecone metadata filter for a request's filters, or None if nothing applies."""
+    plan = _compile_filter(tuple((key, isinstance(value, (int, float))) for key, value in filters.items()))
+    if not plan:
+        return None
+    
+    pinecone_filters = {}
+    for key, field, operator in plan:
+        if operator == "$eq":
+            pinecone_filters[field] = {"$eq": str(filters[key])}
+        else:
+            pinecone_filters.setdefault(field, {})[operator] = filters[key]
+    return pinecone_filters
+
+
+# RRF parameter k -> [1 / (k + rank + 1) for each rank], shared by every fusion call
+_RRF_WEIGHTS: dict[int, list[float]] = {}
+RRF_WEIGHT_TABLE_SIZE = 1024
+
+
+def _rrf_weights(k: int, count: int) -> list[float]:
+    """Reciprocal-rank weights for ranks 0..count-1, computed once per k."""
+    weights = _RRF_WEIGHTS.get(k)
+    if weights is None or len(weights) < count:
+        size = max(count, RRF_WEIGHT_TABLE_SIZE)
+        weights = _RRF_WEIGHTS[k] = [1.0 / (k + rank + 1) for rank in range(size)]
+    return weights
+
+
+# Backoff between readiness checks after creating a Pinecone index (~2 minutes total)
+PINECONE_READY_POLL_DELAYS = (1, 2, 4, 8, 16, 30, 30, 30)
+
+# Cohere rerank input cap, in characters (a conservative stand-in for its token limit)
+RERANK_MAX_CHARS = 2000
+# Candidate pools larger than this are re-ranked as concurrent Cohere sub-batches.
+# Cohere bills one search unit per call of up to 100 documents, so smaller
+# splits only add calls; ordinary fused pools (2x top_k_retrieval) stay in one
+RERANK_BATCH_SIZE = 100
+
+
+def _content_hash(text: str) -> int:
+    """Stable 64-bit content digest used to deduplicate results across searches."""
+    return xxhash.xxh3_64_intdigest(text.encode("utf-8"))
+
 
 class RetrievalError(Exception):
     """Custom exception for retrieval-related errors."""
@@ -56,6 +131,12 @@ class HybridRetriever:
             raise RetrievalError(f"Failed to initialize Pinecone client: {str(e)}", e)
             
         self.index = None
+        # Upserts run on their own threads so a large ingest can't starve
+        # vector_search queries of the default executor
+        self._upsert_executor = ThreadPoolExecutor(
+            max_workers=self.config.pinecone_pool_threads,
+            thread_name_prefix="pinecone-upsert",
+        )
         
         # Cohere re-ranking setup
         self.cohere_client = None
@@ -65,16 +146,18 @@ class HybridRetriever:
             except Exception as e:
                 logger.warning(f"Failed to initialize Cohere client: {e}")
         
-        # BM25 keyword search (in-memory for demo, would use Elasticsearch in production)
-        self.bm25_index = None
-        self.document_store: List[Document] = []
+        # (query, top_k, candidate hashes) -> ranked (index, score) pairs from Cohere
+        self._rerank_cache: OrderedDict[tuple, list[tuple[int, float]]] = OrderedDict()
+        self._rerank_cache_max = self.config.rerank_cache_size
         
-        # Redis cache
-        self.redis_client: Optional[redis.Redis] = None
+        # In-flight retrieve() pipelines keyed by query parameters, for request coalescing
+        self._inflight: dict[tuple, asyncio.Future] = {}
         
         # Performance tracking for production monitoring
         self.total_queries = 0
         self.cache_hits = 0
+        # retrieve() calls answered by joining an identical in-flight pipeline
+        self.coalesced_queries = 0
         self.vector_search_time = 0.0
         self.keyword_search_time = 0.0
         self.rerank_time = 0.0
@@ -95,20 +178,6 @@ class HybridRetriever:
             logger.error(f"Elasticsearch initialization failed: {e}")
             raise RetrievalError(f"Failed to initialize Elasticsearch: {e}", e)
         
-        # Initialize Redis cache
-        try:
-            self.redis_client = redis.from_url(
-                self.config.redis_url,
-                socket_connect_timeout=5,
-                socket_keepalive=True,
-                health_check_interval=30,
-            )
-            await self.redis_client.ping()
-            logger.info("Retrieval cache initialized successfully")
-        except Exception as e:
-            logger.warning(f"Retrieval cache unavailable, operating without cache: {e}")
-            self.redis_client = None
-        
         # Initialize Pinecone index with creation if needed
         try:
             existing_indexes = self.pinecone_client.list_indexes().names()
@@ -125,9 +194,20 @@ class HybridRetriever:
                     ),
                 )
                 
-                # Wait for index to be ready
+                # Poll until the serverless index reports ready (usually well under 60s)
                 logger.info("Waiting for Pinecone index to be ready...")
-                await asyncio.sleep(60)  # Serverless indexes take time to initialize
+                for delay in PINECONE_READY_POLL_DELAYS:
+                    description = await asyncio.to_thread(
+                        self.pinecone_client.describe_index, self.config.pinecone_index_name
+                    )
+                    if description.status["ready"]:
+                        break
+                    await asyncio.sleep(delay)
+                else:
+                    logger.warning(
+                        f"Pinecone index {self.config.pinecone_index_name} not ready after "
+                        f"{sum(PINECONE_READY_POLL_DELAYS)}s, continuing"
+                    )
             
             self.index = self.pinecone_client.Index(self.config.pinecone_index_name)
             logger.info("Pinecone index ready for operations")
@@ -143,13 +223,13 @@ class HybridRetriever:
         if self.elasticsearch_retriever:
             await self.elasticsearch_retriever.close()
         
-        if self.redis_client:
-            await self.redis_client.close()
+        self._upsert_executor.shutdown(wait=False, cancel_futures=True)
         
         logger.info(
             f"Retrieval service statistics - "
             f"Total queries: {self.total_queries}, "
             f"Cache hits: {self.cache_hits}, "
+            f"Coalesced queries: {self.coalesced_queries}, "
             f"Vector errors: {self.vector_search_errors}, "
             f"Keyword errors: {self.keyword_search_errors}, "
             f"Rerank errors: {self.rerank_errors}"
@@ -187,7 +267,7 @@ class HybridRetriever:
             
             # Split documents into chunks
             try:
-                chunks = self.embedder.split_documents(documents)
+                chunks = await self.embedder.split_documents_async(documents)
                 logger.info(f"Split {len(documents)} documents into {len(chunks)} chunks")
             except Exception as e:
                 error_msg = f"Document splitting failed: {str(e)}"
@@ -223,65 +303,14 @@ class HybridRetriever:
                 logger.error(error_msg)
                 errors.append(error_msg)
 
-            # Index in Pinecone (vector search)
-            for i in range(0, len(embedded_chunks), batch_size):
-                batch = embedded_chunks[i:i + batch_size]
-                
-                try:
-                    # Prepare vectors for Pinecone
-                    vectors = []
-                    for j, chunk in enumerate(batch):
-                        if not chunk.metadata.get("embedding"):
-                            logger.warning(f"Skipping chunk {i+j} - no embedding found")
-                            continue
-                            
-                        vector_id = f"{namespace}_{i + j}_{hash(chunk.page_content) % 1000000}"
-                        
-                        # Validate embedding dimension
-                        embedding = chunk.metadata["embedding"]
-                        if len(embedding) != self.config.embedding_dimension:
-                            logger.error(f"Invalid embedding dimension: {len(embedding)}, expected {self.config.embedding_dimension}")
-                            continue
-                        
-                        vectors.append({
-                            "id": vector_id,
-                            "values": embedding,
-                            "metadata": {
-                                "text": chunk.page_content[:1000],  # Limit text size for Pinecone
-                                "source": chunk.metadata.get("source", "unknown"),
-                                "chunk_index": chunk.metadata.get("chunk_index", 0),
-                                "timestamp": int(time.time()),
-                                "namespace": namespace,
-                                "document_id": chunk.metadata.get("document_id", ""),
-                                "content_hash": str(hash(chunk.page_content)),
-                            }
-                        })
-                    
-                    if not vectors:
-                        logger.warning(f"No valid vectors in batch starting at {i}")
-                        continue
-                    
-                    # Upsert to Pinecone with retry logic
-                    max_retries = 3
-                    for attempt in range(max_retries):
-                        try:
-                            await asyncio.to_thread(
-                                self.index.upsert,
-                                vectors=vectors,
-                                namespace=namespace,
-                            )
-                            break
-                        except Exception as e:
-                            if attempt == max_retries - 1:
-                                raise e
-                            await asyncio.sleep(2 ** attempt)  # Exponential backoff
-                    
-                    logger.info(f"Indexed batch {i//batch_size + 1}: {len(vectors)} vectors")
-                    
-                except Exception as e:
-                    error_msg = f"Pinecone batch indexing failed at position {i}: {str(e)}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
+            # Index in Pinecone (vector search): batches upsert concurrently, and each
+            # payload is only built once its batch holds a slot
+            upsert_slots = asyncio.Semaphore(self.config.pinecone_pool_threads)
+            batch_errors = await asyncio.gather(*(
+                self._upsert_batch(embedded_chunks, namespace, i, batch_size, upsert_slots)
+                for i in range(0, len(embedded_chunks), batch_size)
+            ))
+            errors.extend(error for error in batch_errors if error)
 
             processing_time = time.time() - start_time
             
@@ -308,6 +337,90 @@ class HybridRetriever:
                 "errors": [error_msg],
             }
 
+    def _pinecone_vectors(
+        self,
+        batch: list[Document],
+        offset: int,
+        namespace: str,
+    ) -> list[dict[str, Any]]:
+        """Build Pinecone upsert payloads for one batch, skipping chunks without a valid embedding."""
+        vectors = []
+        for j, chunk in enumerate(batch):
+            if not chunk.metadata.get("embedding"):
+                logger.warning(f"Skipping chunk {offset + j} - no embedding found")
+                continue
+                
+            # Stable across processes, unlike the salted built-in hash()
+            content_hash = _content_hash(chunk.page_content)
+            vector_id = f"{namespace}_{offset + j}_{content_hash % 1000000}"
+            
+            # Validate embedding dimension
+            embedding = chunk.metadata["embedding"]
+            if len(embedding) != self.config.embedding_dimension:
+                logger.error(f"Invalid embedding dimension: {len(embedding)}, expected {self.config.embedding_dimension}")
+                continue
+            
+            vectors.append({
+                "id": vector_id,
+                "values": embedding,
+                "metadata": {
+                    "text": chunk.page_content[:1000],  # Limit text size for Pinecone
+                    "source": chunk.metadata.get("source", "unknown"),
+                    "chunk_index": chunk.metadata.get("chunk_index", 0),
+                    "timestamp": int(time.time()),
+                    "namespace": namespace,
+                    "document_id": chunk.metadata.get("document_id", ""),
+                    "content_hash": str(content_hash),
+                }
+            })
+        return vectors
+
+    async def _upsert_batch(
+        self,
+        chunks: list[Document],
+        namespace: str,
+        offset: int,
+        batch_size: int,
+        slots: asyncio.Semaphore,
+    ) -> Optional[str]:
+        """
+        Upsert chunks[offset:offset + batch_size] to Pinecone with retries.
+        
+        The payload is built after acquiring the shared semaphore, so at most
+        one batch of vector dicts per slot exists at a time.
+        
+        Returns:
+            Error message if the batch could not be indexed, otherwise None
+        """
+        async with slots:
+            try:
+                vectors = self._pinecone_vectors(chunks[offset:offset + batch_size], offset, namespace)
+                if not vectors:
+                    logger.warning(f"No valid vectors in batch starting at {offset}")
+                    return None
+                
+                # Upsert to Pinecone with retry logic
+                max_retries = 3
+                for attempt in range(max_retries):
+                    try:
+                        await asyncio.get_running_loop().run_in_executor(
+                            self._upsert_executor,
+                            partial(self.index.upsert, vectors=vectors, namespace=namespace),
+                        )
+                        break
+                    except Exception as e:
+                        if attempt == max_retries - 1:
+                            raise e
+                        await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                
+                logger.info(f"Indexed batch {offset//batch_size + 1}: {len(vectors)} vectors")
+                return None
+                
+            except Exception as e:
+                error_msg = f"Pinecone batch indexing failed at position {offset}: {str(e)}"
+                logger.error(error_msg)
+                return error_msg
+
     async def vector_search(
         self,
         query: str,
@@ -350,19 +463,7 @@ class HybridRetriever:
             namespace = namespace.strip().lower()
             
             # Prepare filters for Pinecone
-            pinecone_filters = {}
-            if filters:
-                for key, value in filters.items():
-                    if key in ["source", "document_id", "namespace"]:
-                        pinecone_filters[key] = {"$eq": str(value)}
-                    elif key.endswith("_min") and isinstance(value, (int, float)):
-                        base_key = key[:-4]
-                        pinecone_filters[base_key] = pinecone_filters.get(base_key, {})
-                        pinecone_filters[base_key]["$gte"] = value
-                    elif key.endswith("_max") and isinstance(value, (int, float)):
-                        base_key = key[:-4]
-                        pinecone_filters[base_key] = pinecone_filters.get(base_key, {})
-                        pinecone_filters[base_key]["$lte"] = value
+            pinecone_filters = _pinecone_filter(filters) if filters else None
             
             # Search Pinecone with retry logic
             max_retries = 3
@@ -375,7 +476,7 @@ class HybridRetriever:
                         vector=query_embedding,
                         top_k=top_k,
                         namespace=namespace,
-                        filter=pinecone_filters if pinecone_filters else None,
+                        filter=pinecone_filters,
                         include_metadata=True,
                     )
                     break
@@ -389,22 +490,21 @@ class HybridRetriever:
                 logger.info(f"No vector search results found for query in namespace {namespace}")
                 return []
             
-            # Convert to LangChain documents
+            # Convert to LangChain documents; per-call search context is built once and
+            # merged into each match's (already per-match) metadata dict without a copy
+            search_context = {
+                "search_type": "vector",
+                "search_namespace": namespace,
+                "search_timestamp": int(time.time()),
+            }
             documents = []
             for match in search_results.matches:
                 try:
-                    metadata = match.metadata or {}
-                    doc = Document(
-                        page_content=metadata.get("text", ""),
-                        metadata={
-                            **metadata,
-                            "vector_score": float(match.score),
-                            "search_type": "vector",
-                            "search_id": match.id,
-                            "search_namespace": namespace,
-                            "search_timestamp": int(time.time()),
-                        }
-                    )
+                    metadata = match.metadata if match.metadata is not None else {}
+                    metadata.update(search_context)
+                    metadata["vector_score"] = float(match.score)
+                    metadata["search_id"] = match.id
+                    doc = Document(page_content=metadata.get("text", ""), metadata=metadata)
                     documents.append(doc)
                 except Exception as e:
                     logger.warning(f"Failed to process search result {match.id}: {e}")
@@ -452,14 +552,15 @@ class HybridRetriever:
                 top_k=top_k
             )
             
-            # Add keyword search metadata
-            for i, doc in enumerate(documents):
-                doc.metadata.update({
-                    "search_type": "keyword_elasticsearch",
-                    "keyword_rank": i + 1,
-                    "search_timestamp": int(time.time()),
-                    "query_tokens": query.strip().lower().split(),
-                })
+            # Add keyword search metadata; the shared context is computed once per call
+            search_context = {
+                "search_type": "keyword_elasticsearch",
+                "search_timestamp": int(time.time()),
+                "query_tokens": query.strip().lower().split(),
+            }
+            for i, doc in enumerate(documents, 1):
+                doc.metadata.update(search_context)
+                doc.metadata["keyword_rank"] = i
             
             self.keyword_search_time += time.time() - start_time
             logger.info(f"Elasticsearch keyword search returned {len(documents)} results in {(time.time() - start_time):.3f}s")
@@ -488,70 +589,65 @@ class HybridRetriever:
             Fused and ranked results with RRF scores
         """
         try:
-            # Create document lookup by content hash for deduplication
-            all_docs = {}
+            # Stable content digests (Python's hash() is salted per process)
+            vector_hashes = [_content_hash(doc.page_content) for doc in vector_results]
+            keyword_hashes = [_content_hash(doc.page_content) for doc in keyword_results]
+            rrf_by_rank = _rrf_weights(k, max(len(vector_results), len(keyword_results)))
+            
+            # Score on digests first; Documents are only built once per unique result
+            scores: dict[int, float] = {}
+            base_docs: dict[int, Document] = {}
+            keyword_overrides: dict[int, Document] = {}
+            vector_ranks: dict[int, int] = {}
+            keyword_ranks: dict[int, int] = {}
             
             # Process vector results
-            for rank, doc in enumerate(vector_results):
-                try:
-                    content_hash = hash(doc.page_content)
-                    if content_hash not in all_docs:
-                        all_docs[content_hash] = Document(
-                            page_content=doc.page_content,
-                            metadata={**doc.metadata}
-                        )
-                        all_docs[content_hash].metadata["rrf_score"] = 0.0
-                    
-                    # Add RRF score from vector search
-                    rrf_contribution = 1.0 / (k + rank + 1)
-                    all_docs[content_hash].metadata["rrf_score"] += rrf_contribution
-                    all_docs[content_hash].metadata["vector_rank"] = rank + 1
-                    all_docs[content_hash].metadata["vector_rrf_contribution"] = rrf_contribution
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to process vector result at rank {rank}: {e}")
-                    continue
-
+            for rank, content_hash in enumerate(vector_hashes):
+                if content_hash not in base_docs:
+                    base_docs[content_hash] = vector_results[rank]
+                    scores[content_hash] = 0.0
+                scores[content_hash] += rrf_by_rank[rank]
+                vector_ranks[content_hash] = rank
+            
             # Process keyword results
-            for rank, doc in enumerate(keyword_results):
-                try:
-                    content_hash = hash(doc.page_content)
-                    if content_hash not in all_docs:
-                        all_docs[content_hash] = Document(
-                            page_content=doc.page_content,
-                            metadata={**doc.metadata}
-                        )
-                        all_docs[content_hash].metadata["rrf_score"] = 0.0
-                    else:
-                        # Merge metadata from keyword search
-                        for key, value in doc.metadata.items():
-                            if key.startswith("bm25_") or key in ["search_type", "keyword_rank", "query_tokens"]:
-                                all_docs[content_hash].metadata[key] = value
-                    
-                    # Add RRF score from keyword search
-                    rrf_contribution = 1.0 / (k + rank + 1)
-                    all_docs[content_hash].metadata["rrf_score"] += rrf_contribution
-                    all_docs[content_hash].metadata["keyword_rank"] = rank + 1
-                    all_docs[content_hash].metadata["keyword_rrf_contribution"] = rrf_contribution
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to process keyword result at rank {rank}: {e}")
-                    continue
-
-            # Sort by RRF score and add final ranking metadata
-            ranked_docs = sorted(
-                all_docs.values(),
-                key=lambda x: x.metadata["rrf_score"],
-                reverse=True
-            )
+            for rank, content_hash in enumerate(keyword_hashes):
+                if content_hash not in base_docs:
+                    base_docs[content_hash] = keyword_results[rank]
+                    scores[content_hash] = 0.0
+                else:
+                    # Keyword metadata is merged onto the first-seen document below
+                    keyword_overrides[content_hash] = keyword_results[rank]
+                scores[content_hash] += rrf_by_rank[rank]
+                keyword_ranks[content_hash] = rank
             
-            for i, doc in enumerate(ranked_docs):
-                doc.metadata.update({
-                    "final_rank": i + 1,
-                    "fusion_method": "rrf",
-                    "fusion_k_parameter": k,
-                    "fusion_timestamp": int(time.time()),
-                })
+            # Sort by RRF score and build the fused documents with final ranking metadata
+            fusion_timestamp = int(time.time())
+            ranked_docs = []
+            for final_rank, content_hash in enumerate(sorted(scores, key=scores.__getitem__, reverse=True), 1):
+                base_doc = base_docs[content_hash]
+                metadata = {**base_doc.metadata}
+                
+                keyword_doc = keyword_overrides.get(content_hash)
+                if keyword_doc is not None:
+                    for key, value in keyword_doc.metadata.items():
+                        if key.startswith("bm25_") or key in _KEYWORD_MERGE_KEYS:
+                            metadata[key] = value
+                
+                metadata["rrf_score"] = scores[content_hash]
+                rank = vector_ranks.get(content_hash)
+                if rank is not None:
+                    metadata["vector_rank"] = rank + 1
+                    metadata["vector_rrf_contribution"] = rrf_by_rank[rank]
+                rank = keyword_ranks.get(content_hash)
+                if rank is not None:
+                    metadata["keyword_rank"] = rank + 1
+                    metadata["keyword_rrf_contribution"] = rrf_by_rank[rank]
+                
+                metadata["final_rank"] = final_rank
+                metadata["fusion_method"] = "rrf"
+                metadata["fusion_k_parameter"] = k
+                metadata["fusion_timestamp"] = fusion_timestamp
+                ranked_docs.append(Document(page_content=base_doc.page_content, metadata=metadata))
 
             logger.info(f"RRF fusion combined {len(vector_results)} vector + {len(keyword_results)} keyword results into {len(ranked_docs)} unique results")
             return ranked_docs
@@ -573,7 +669,7 @@ class HybridRetriever:
         
         Args:
             query: Original search query
-            documents: Documents to re-rank
+            documents: Documents to re-rank; their metadata is updated in place
             top_k: Number of top results to return
             
         Returns:
@@ -590,67 +686,65 @@ class HybridRetriever:
         start_time = time.time()
         
         try:
-            # Prepare documents for Cohere (limit text length)
-            texts = []
-            for doc in documents:
-                text = doc.page_content
-                if len(text) > 2000:  # Cohere has text length limits
-                    text = text[:2000] + "..."
-                texts.append(text)
+            # Prepare documents for Cohere (limit text length); short texts pass through as-is
+            texts = [
+                text if len(text) <= RERANK_MAX_CHARS else f"{text[:RERANK_MAX_CHARS]}..."
+                for text in (doc.page_content for doc in documents)
+            ]
             
             if not texts:
                 return []
             
-            # Re-rank using Cohere with timeout and retry
-            max_retries = 3
-            rerank_result = None
-            
-            for attempt in range(max_retries):
-                try:
-                    async with asyncio.timeout(30.0):  # 30-second timeout
-                        rerank_result = await self.cohere_client.rerank(
-                            model=self.config.cohere_rerank_model,
-                            query=query.strip(),
-                            documents=texts,
-                            top_k=min(top_k, len(documents)),
-                        )
-                    break
-                except Exception as e:
-                    if attempt == max_retries - 1:
-                        raise e
-                    logger.warning(f"Cohere rerank attempt {attempt + 1} failed: {e}")
-                    await asyncio.sleep(2 ** attempt)
+            # Repeat queries over the same candidates reuse the previous ordering
+            query = query.strip()
+            cache_key = (query, top_k, tuple(_content_hash(text) for text in texts))
+            ranked = self._rerank_cache.get(cache_key)
+            if ranked is not None:
+                self._rerank_cache.move_to_end(cache_key)
+            else:
+                # Re-rank using Cohere; large candidate pools are split into sub-batches
+                # scored concurrently, then merged by relevance score
+                batch_results = await asyncio.gather(*(
+                    self._rerank_batch(query, texts[start:start + RERANK_BATCH_SIZE], start, top_k)
+                    for start in range(0, len(texts), RERANK_BATCH_SIZE)
+                ))
+                ranked = sorted(
+                    (pair for batch in batch_results for pair in batch),
+                    key=lambda pair: pair[1],
+                    reverse=True,
+                )[:top_k]
+                if ranked and self._rerank_cache_max > 0:
+                    self._rerank_cache[cache_key] = ranked
+                    while len(self._rerank_cache) > self._rerank_cache_max:
+                        self._rerank_cache.popitem(last=False)
             
-            if not rerank_result or not rerank_result.results:
+            if not ranked:
                 logger.warning("Empty rerank results from Cohere")
                 return documents[:top_k]
             
-            # Reorder documents based on re-ranking with comprehensive metadata
+            # Reorder documents based on re-ranking; the fused documents are built
+            # per call, so rerank metadata is added in place rather than copied
             reranked_docs = []
-            for result in rerank_result.results:
+            rerank_model = self.config.cohere_rerank_model
+            rerank_timestamp = int(time.time())
+            for index, relevance_score in ranked:
                 try:
-                    if result.index >= len(documents):
-                        logger.warning(f"Invalid rerank index {result.index}")
+                    if index >= len(documents):
+                        logger.warning(f"Invalid rerank index {index}")
                         continue
                         
-                    original_doc = documents[result.index]
-                    
-                    # Create enhanced document with rerank metadata
-                    reranked_doc = Document(
-                        page_content=original_doc.page_content,
-                        metadata={
-                            **original_doc.metadata,
-                            "rerank_score": float(result.relevance_score),
-                            "rerank_position": len(reranked_docs) + 1,
-                            "rerank_model": self.config.cohere_rerank_model,
-                            "rerank_timestamp": int(time.time()),
-                            "original_rank": result.index + 1,
-                        }
-                    )
+                    reranked_doc = documents[index]
+                    reranked_doc.metadata.update({
+                        "rerank_score": float(relevance_score),
+                        "rerank_position": len(reranked_docs) + 1,
+                        "rerank_model": rerank_model,
+                        "rerank_timestamp": rerank_timestamp,
+                        "original_rank": index + 1,
+                    })
                     reranked_docs.append(reranked_doc)
                     
                 except Exception as e:
-                    logger.warning(f"Failed to process rerank result {result.index}: {e}")
+                    logger.warning(f"Failed to process rerank result {index}: {e}")
                     continue
             
             self.rerank_time += time.time() - start_time
@@ -664,6 +758,39 @@ class HybridRetriever:
             logger.warning(f"Falling back to original document ranking")
             return documents[:top_k]
 
+    async def _rerank_batch(
+        self,
+        query: str,
+        texts: list[str],
+        offset: int,
+        top_k: int,
+    ) -> list[tuple[int, float]]:
+        """Re-rank one sub-batch with timeout and retry; returns (document index, score) pairs."""
+        max_retries = 3
+        
+        for attempt in range(max_retries):
+            try:
+                async with asyncio.timeout(30.0):  # 30-second timeout
+                    rerank_result = await self.cohere_client.rerank(
+                        model=self.config.cohere_rerank_model,
+                        query=query,
+                        documents=texts,
+                        top_k=min(top_k, len(texts)),
+                    )
+                break
+            except Exception as e:
+                if attempt == max_retries - 1:
+                    raise e
+                logger.warning(f"Cohere rerank attempt {attempt + 1} failed: {e}")
+                await asyncio.sleep(2 ** attempt)
+        
+        if not rerank_result or not rerank_result.results:
+            return []
+        return [
+            (offset + result.index, result.relevance_score)
+            for result in rerank_result.results
+        ]
+
     async def retrieve(
         self,
         query: str,
@@ -689,6 +816,41 @@ class HybridRetriever:
             return []
             
         self.total_queries += 1
+        
+        # Identical concurrent queries share one search/fusion/rerank pipeline
+        key = (
+            namespace,
+            query.strip(),
+            top_k,
+            use_reranking,
+            repr(sorted(filters.items())) if filters else None,
+        )
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._retrieve(query, namespace, filters, top_k, use_reranking)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            return await asyncio.shield(task)
+        
+        self.coalesced_queries += 1
+        results = await asyncio.shield(task)
+        # Waiters get their own Documents so callers can't mutate each other's metadata
+        return [
+            Document(page_content=doc.page_content, metadata=dict(doc.metadata))
+            for doc in results
+        ]
+
+    async def _retrieve(
+        self,
+        query: str,
+        namespace: str,
+        filters: Optional[dict],
+        top_k: int,
+        use_reranking: bool,
+    ) -> list[Document]:
+        """Run one hybrid search, fusion and re-ranking pass for retrieve()."""
         start_time = time.time()
         
         try:
@@ -702,28 +864,35 @@ class HybridRetriever:
                 filters=filters,
             )
             
-            keyword_task = asyncio.to_thread(
-                self.keyword_search,
+            keyword_task = self.keyword_search(
                 query=query.strip(),
+                namespace=namespace,
+                filters=filters,
                 top_k=self.config.top_k_retrieval,
             )
             
-            # Wait for both searches with error handling
+            # Wait for both searches with error handling; each leg is bounded on its own
+            # so a slow backend is dropped without discarding the other's results
+            leg_timeout = self.config.retrieval_timeout_seconds
             try:
                 vector_results, keyword_results = await asyncio.gather(
-                    vector_task, keyword_task, return_exceptions=True
+                    asyncio.wait_for(vector_task, leg_timeout),
+                    asyncio.wait_for(keyword_task, leg_timeout),
+                    return_exceptions=True,
                 )
             except Exception as e:
                 logger.error(f"Search gathering failed: {e}")
                 vector_results, keyword_results = [], []
             
-            # Handle search exceptions
+            # Handle search exceptions (the searches catch their own errors, so these are timeouts)
             if isinstance(vector_results, Exception):
-                logger.error(f"Vector search failed: {vector_results}")
+                self.vector_search_errors += 1
+                logger.error(f"Vector search failed: {vector_results!r}")
                 vector_results = []
             
             if isinstance(keyword_results, Exception):
-                logger.error(f"Keyword search failed: {keyword_results}")
+                self.keyword_search_errors += 1
+                logger.error(f"Keyword search failed: {keyword_results!r}")
                 keyword_results = []
             
             # Ensure we have lists
@@ -747,18 +916,19 @@ class HybridRetriever:
             else:
                 final_results = fused_results[:top_k]
             
-            # Add comprehensive retrieval metadata
+            # Add comprehensive retrieval metadata, built once and shared by every result
             retrieval_time = time.time() - start_time
+            retrieval_metadata = {
+                "retrieval_time_ms": retrieval_time * 1000,
+                "retrieval_method": "hybrid_rrf",
+                "query": query.strip(),
+                "namespace": namespace,
+                "retrieval_timestamp": int(time.time()),
+                "filters_applied": bool(filters),
+                "reranking_used": use_reranking and self.cohere_client is not None,
+            }
             for doc in final_results:
-                doc.metadata.update({
-                    "retrieval_time_ms": retrieval_time * 1000,
-                    "retrieval_method": "hybrid_rrf",
-                    "query": query.strip(),
-                    "namespace": namespace,
-                    "retrieval_timestamp": int(time.time()),
-                    "filters_applied": bool(filters),
-                    "reranking_used": use_reranking and self.cohere_client is not None,
-                })
+                doc.metadata.update(retrieval_metadata)
 
             logger.info(f"Hybrid retrieval completed: {len(final_results)} results in {retrieval_time:.3f}s")
             return final_results
@@ -784,6 +954,7 @@ class HybridRetriever:
         return {
             "total_queries": self.total_queries,
             "cache_hits": self.cache_hits,
+            "coalesced_queries": self.coalesced_queries,
             "avg_vector_search_ms": avg_vector_time * 1000,
             "avg_keyword_search_ms": avg_keyword_time * 1000,
             "avg_rerank_ms": avg_rerank_time * 1000,
@@ -808,37 +979,13 @@ class HybridRetriever:
             "checks": {},
         }
 
-        # Check Pinecone connectivity
-        try:
-            if self.index:
-                stats = await asyncio.to_thread(self.index.describe_index_stats)
-                health["checks"]["pinecone_available"] = True
-                health["checks"]["total_vectors"] = stats.get("total_vector_count", 0)
-                health["checks"]["index_fullness"] = stats.get("index_fullness", 0)
-            else:
-                health["checks"]["pinecone_available"] = False
-        except Exception as e:
-            health["checks"]["pinecone_available"] = False
-            health["checks"]["pinecone_error"] = str(e)
-
-        # Check Elasticsearch
-        try:
-            if self.elasticsearch_retriever:
-                es_health = await self.elasticsearch_retriever.health_check()
-                health["checks"]["elasticsearch_status"] = es_health["status"]
-                health["checks"]["elasticsearch_details"] = es_health["checks"]
-            else:
-                health["checks"]["elasticsearch_status"] = "unavailable"
-        except Exception as e:
-            health["checks"]["elasticsearch_status"] = "unhealthy"
-            health["checks"]["elasticsearch_error"] = str(e)
-
-        # Check embedding service
-        try:
-            embed_health = await self.embedder.health_check()
-            health["checks"]["embedding_service"] = embed_health["status"]
-        except Exception:
-            health["checks"]["embedding_service"] = "unhealthy"
+        # Probe Pinecone, Elasticsearch and the embedder concurrently
+        for checks in await asyncio.gather(
+            self._check_pinecone(),
+            self._check_elasticsearch(),
+            self._check_embedder(),
+        ):
+            health["checks"].update(checks)
 
         # Check Cohere availability
         health["checks"]["cohere_available"] = self.cohere_client is not None
@@ -859,4 +1006,39 @@ class HybridRetriever:
                 health["status"] = "degraded"
                 break
 
-        return health
\ No newline at end of file
+        return health
+
+    async def _check_pinecone(self) -> dict[str, Any]:
+        """Pinecone connectivity checks for health_check()."""
+        try:
+            if not self.index:
+                return {"pinecone_available": False}
+            stats = await asyncio.to_thread(self.index.describe_index_stats)
+            return {
+                "pinecone_available": True,
+                "total_vectors": stats.get("total_vector_count", 0),
+                "index_fullness": stats.get("index_fullness", 0),
+            }
+        except Exception as e:
+            return {"pinecone_available": False, "pinecone_error": str(e)}
+
+    async def _check_elasticsearch(self) -> dict[str, Any]:
+        """Elasticsearch checks for health_check()."""
+        try:
+            if not self.elasticsearch_retriever:
+                return {"elasticsearch_status": "unavailable"}
+            es_health = await self.elasticsearch_retriever.health_check()
+            return {
+                "elasticsearch_status": es_health["status"],
+                "elasticsearch_details": es_health["checks"],
+            }
+        except Exception as e:
+            return {"elasticsearch_status": "unhealthy", "elasticsearch_error": str(e)}
+
+    async def _check_embedder(self) -> dict[str, Any]:
+        """Embedding service check for health_check()."""
+        try:
+            embed_health = await self.embedder.health_check()
+            return {"embedding_service": embed_health["status"]}
+        except Exception:
+            return {"embedding_service": "unhealthy"}
@@ -5,16 +5,151 @@ Replaces in-memory BM25 with scalable Elasticsearch cluster.
 
 import asyncio
 import logging
+import re
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
+import xxhash
+from elastic_transport import SerializationError
 from elasticsearch import AsyncElasticsearch, exceptions as es_exceptions
+from elasticsearch.helpers import async_streaming_bulk
+from elasticsearch.serializer import JSONSerializer
 from langchain.schema import Document
 
 from src.config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on a single bulk request body, alongside the per-request document count
+BULK_MAX_CHUNK_BYTES = 10 * 1024 * 1024
+
+class ORJSONSerializer(JSONSerializer):
+    """JSON transport serializer backed by orjson; keeps the client's default() conversions."""
+
+    def loads(self, data: bytes) -> Any:
+        # Some JSON-typed responses have an empty body
+        if data == b"":
+            return None
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError as e:
+            raise SerializationError(f"Unable to deserialize as JSON: {data!r}", errors=(e,))
+
+    def dumps(self, data: Any) -> bytes:
+        # Pre-encoded bodies are forwarded as-is
+        if isinstance(data, str):
+            return data.encode("utf-8", "surrogatepass")
+        if isinstance(data, bytes):
+            return data
+        try:
+            return orjson.dumps(
+                data,
+                default=self.default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+            )
+        except (orjson.JSONEncodeError, TypeError) as e:
+            raise SerializationError(
+                f"Unable to serialize to JSON: {data!r} (type: {type(data).__name__})", errors=(e,)
+            )
+
+
+class ORJSONNdjsonSerializer(ORJSONSerializer):
+    """Newline-delimited variant used for _bulk and _msearch bodies."""
+
+    mimetype = "application/x-ndjson"
+
+    def loads(self, data: bytes) -> Any:
+        return [ORJSONSerializer.loads(self, line) for line in data.split(b"\n") if line]
+
+    def dumps(self, data: Any) -> bytes:
+        if isinstance(data, (str, bytes)):
+            return ORJSONSerializer.dumps(self, data)
+        return b"".join(ORJSONSerializer.dumps(self, line) + b"\n" for line in data)
+
+
+# Request and response bodies (including the 8.x compatibility mimetypes) go through orjson
+_ORJSON_SERIALIZER = ORJSONSerializer()
+_ORJSON_NDJSON_SERIALIZER = ORJSONNdjsonSerializer()
+ES_SERIALIZERS = {
+    "application/json": _ORJSON_SERIALIZER,
+    "application/vnd.elasticsearch+json": _ORJSON_SERIALIZER,
+    "application/x-ndjson": _ORJSON_NDJSON_SERIALIZER,
+    "application/vnd.elasticsearch+x-ndjson": _ORJSON_NDJSON_SERIALIZER,
+}
+
+# Weight of the newest sample in the average query time (~20-query horizon)
+QUERY_TIME_EWMA_ALPHA = 0.05
+
+# Static parts of the BM25 search body, shared (read-only) by every request
+_ES_MATCH_FIELDS = ["content^1.0", "title^2.0"]
+_ES_HIGHLIGHT = {
+    "fields": {
+        "content": {
+            "fragment_size": 150,
+            "number_of_fragments": 3
+        },
+        "title": {}
+    }
+}
+
+# 17-character VINs (no I, O or Q) and the filters that make a query exact
+_VIN_PATTERN = re.compile(r"[A-HJ-NPR-Z0-9]{17}")
+
+# Supported search filter keys -> Elasticsearch filter clause builders
+_ES_FILTER_BUILDERS = {
+    "source": lambda value: {"term": {"source": value}},
+    "document_type": lambda value: {"term": {"document_type": value}},
+    "vin": lambda value: {"term": {"vin": value}},
+    "make": lambda value: {"term": {"make": value}},
+    "model": lambda value: {"term": {"model": value}},
+    "year_min": lambda value: {"range": {"year": {"gte": value}}},
+    "year_max": lambda value: {"range": {"year": {"lte": value}}},
+    "price_min": lambda value: {"range": {"price": {"gte": value}}},
+    "price_max": lambda value: {"range": {"price": {"lte": value}}},
+}
+
+
+def _bulk_action(doc: Document, namespace: str, index_name: str) -> Dict[str, Any]:
+    """Build the bulk index action for one document."""
+    # Generate document ID from a stable content hash so re-indexing is idempotent
+    # (built-in hash() is salted per process)
+    content_hash = xxhash.xxh3_64_hexdigest(doc.page_content.encode("utf-8"))
+    
+    # Document data
+    doc_data = {
+        "content": doc.page_content,
+        "title": doc.metadata.get("title", ""),
+        "source": doc.metadata.get("source", "unknown"),
+        "document_type": doc.metadata.get("document_type", "text"),
+        "namespace": namespace,
+        "chunk_index": doc.metadata.get("chunk_index", 0),
+        "total_chunks": doc.metadata.get("total_chunks", 1),
+        "content_hash": content_hash,
+        "timestamp": doc.metadata.get("timestamp", time.time()),
+        "embedding_id": doc.metadata.get("embedding_id", ""),
+    }
+    
+    # Add vehicle-specific metadata if available
+    if "vin" in doc.metadata:
+        doc_data.update({
+            "vin": doc.metadata["vin"],
+            "make": doc.metadata.get("make", ""),
+            "model": doc.metadata.get("model", ""),
+            "year": doc.metadata.get("year", 0),
+            "price": doc.metadata.get("price", 0.0),
+            "mileage": doc.metadata.get("mileage", 0),
+            "dealer_id": doc.metadata.get("dealer_id", ""),
+        })
+    
+    return {
+        "_op_type": "index",
+        "_index": index_name,
+        "_id": f"{namespace}_{content_hash}",
+        "_source": doc_data,
+    }
+
 
 class ElasticsearchError(Exception):
     """Custom exception for Elasticsearch-related errors."""
@@ -46,6 +181,9 @@ class ElasticsearchRetriever:
                 request_timeout=30,
                 max_retries=3,
                 retry_on_timeout=True,
+                connections_per_node=self.config.elasticsearch_connections_per_node,
+                http_compress=True,
+                serializers=ES_SERIALIZERS,
             )
         else:
             # Self-hosted Elasticsearch
@@ -58,6 +196,9 @@ class ElasticsearchRetriever:
                 request_timeout=30,
                 max_retries=3,
                 retry_on_timeout=True,
+                connections_per_node=self.config.elasticsearch_connections_per_node,
+                http_compress=True,
+                serializers=ES_SERIALIZERS,
             )
         
         # Index configuration
@@ -69,6 +210,14 @@ class ElasticsearchRetriever:
         self.failed_queries = 0
         self.failed_index_operations = 0
         self.avg_query_time = 0.0
+        self.cache_hits = 0
+        
+        # (query, namespace, filters, top_k) -> (expiry, documents); BM25 results only
+        # change when the corpus does, so indexing clears the cache. That only reaches
+        # this process: other workers keep their entries until the TTL expires.
+        self._search_cache: OrderedDict[tuple, Tuple[float, List[Document]]] = OrderedDict()
+        self._search_cache_max = self.config.elasticsearch_cache_size
+        self._search_cache_ttl = self.config.elasticsearch_cache_ttl_seconds
 
     async def initialize(self) -> None:
         """Initialize Elasticsearch connection and create indexes."""
@@ -263,79 +412,35 @@ class ElasticsearchRetriever:
             
             index_name = f"{self.index_prefix}-documents-{namespace}"
             
-            # Process documents in batches
-            for i in range(0, len(documents), batch_size):
-                batch = documents[i:i + batch_size]
-                
-                try:
-                    # Prepare bulk operations
-                    bulk_operations = []
-                    
-                    for doc in batch:
-                        # Generate document ID from content hash
-                        content_hash = str(hash(doc.page_content))
-                        doc_id = f"{namespace}_{content_hash}"
-                        
-                        # Index operation
-                        bulk_operations.append({
-                            "index": {
-                                "_index": index_name,
-                                "_id": doc_id
-                            }
-                        })
-                        
-                        # Document data
-                        doc_data = {
-                            "content": doc.page_content,
-                            "title": doc.metadata.get("title", ""),
-                            "source": doc.metadata.get("source", "unknown"),
-                            "document_type": doc.metadata.get("document_type", "text"),
-                            "namespace": namespace,
-                            "chunk_index": doc.metadata.get("chunk_index", 0),
-                            "total_chunks": doc.metadata.get("total_chunks", 1),
-                            "content_hash": content_hash,
-                            "timestamp": doc.metadata.get("timestamp", time.time()),
-                            "embedding_id": doc.metadata.get("embedding_id", ""),
-                        }
-                        
-                        # Add vehicle-specific metadata if available
-                        if "vin" in doc.metadata:
-                            doc_data.update({
-                                "vin": doc.metadata["vin"],
-                                "make": doc.metadata.get("make", ""),
-                                "model": doc.metadata.get("model", ""),
-                                "year": doc.metadata.get("year", 0),
-                                "price": doc.metadata.get("price", 0.0),
-                                "mileage": doc.metadata.get("mileage", 0),
-                                "dealer_id": doc.metadata.get("dealer_id", ""),
-                            })
-                        
-                        bulk_operations.append(doc_data)
-                    
-                    # Execute bulk operation
-                    response = await self.es_client.bulk(
-                        operations=bulk_operations,
-                        refresh=True
-                    )
-                    
-                    # Check for errors
-                    if response.get("errors"):
-                        for item in response["items"]:
-                            if "index" in item and "error" in item["index"]:
-                                error_msg = item["index"]["error"]["reason"]
-                                errors.append(f"Bulk index error: {error_msg}")
-                    else:
-                        indexed_count += len(batch)
-                    
-                    self.total_index_operations += 1
-                    logger.info(f"Indexed batch {i//batch_size + 1}: {len(batch)} documents")
-                    
-                except Exception as e:
-                    self.failed_index_operations += 1
-                    error_msg = f"Batch indexing failed at position {i}: {str(e)}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
-
+            # Stream one action per document; the helper packs them into bulk
+            # requests of at most batch_size documents / BULK_MAX_CHUNK_BYTES
+            actions = (_bulk_action(doc, namespace, index_name) for doc in documents)
+            async for ok, item in async_streaming_bulk(
+                self.es_client,
+                actions,
+                chunk_size=batch_size,
+                max_chunk_bytes=BULK_MAX_CHUNK_BYTES,
+                raise_on_error=False,
+                raise_on_exception=False,
+            ):
+                if ok:
+                    indexed_count += 1
+                else:
+                    error = item.get("index", {}).get("error", item)
+                    reason = error.get("reason", error) if isinstance(error, dict) else error
+                    errors.append(f"Bulk index error: {reason}")
+            
+            # One refresh for the whole ingest instead of one per bulk request
+            if indexed_count:
+                await self.es_client.indices.refresh(index=index_name)
+                self._search_cache.clear()
+            
+            batch_count = (len(documents) + batch_size - 1) // batch_size
+            self.total_index_operations += batch_count
+            if errors:
+                self.failed_index_operations += 1
+            logger.info(f"Indexed {indexed_count}/{len(documents)} documents in {batch_count} bulk requests")
+            
             processing_time = time.time() - start_time
             
             result = {
@@ -343,7 +448,7 @@ class ElasticsearchRetriever:
                 "processing_time_ms": processing_time * 1000,
                 "errors": errors,
                 "namespace": namespace,
-                "batch_count": (len(documents) + batch_size - 1) // batch_size,
+                "batch_count": batch_count,
             }
             
             logger.info(f"Elasticsearch indexing completed: {result}")
@@ -359,6 +464,76 @@ class ElasticsearchRetriever:
                 "errors": [error_msg],
             }
 
+    def _build_es_query(
+        self,
+        query: str,
+        namespace: str,
+        filters: Optional[Dict[str, Any]],
+        top_k: int,
+    ) -> Dict[str, Any]:
+        """Build the BM25 search body shared by search() and search_batch()."""
+        query = query.strip()
+        filter_clauses = [{"term": {"namespace": namespace}}]
+        if filters:
+            filter_clauses.extend(
+                _ES_FILTER_BUILDERS[key](value)
+                for key, value in filters.items()
+                if key in _ES_FILTER_BUILDERS
+            )
+        
+        multi_match = {
+            "query": query,
+            "fields": _ES_MATCH_FIELDS,
+            "type": "best_fields",
+            "operator": "or",
+        }
+        # A bare VIN is an exact token: fuzzy term expansion only adds latency there.
+        # Filters don't count, since the query text alongside them is still free text.
+        if _VIN_PATTERN.fullmatch(query.upper()) is None:
+            multi_match["fuzziness"] = "AUTO"
+            multi_match["prefix_length"] = 2
+            multi_match["max_expansions"] = 10
+        
+        return {
+            "query": {
+                "bool": {
+                    "must": [{"multi_match": multi_match}],
+                    "filter": filter_clauses
+                }
+            },
+            "highlight": _ES_HIGHLIGHT,
+            "size": top_k,
+            "_source": True
+        }
+
+    def _parse_hits(self, hits: List[Dict[str, Any]], query: str) -> List[Document]:
+        """Convert Elasticsearch hits into documents with BM25 score metadata."""
+        search_timestamp = int(time.time())
+        query = query.strip()
+        documents = []
+        for hit in hits:
+            try:
+                # _source is freshly decoded per hit, so it becomes the metadata dict
+                # directly; the content moves to page_content rather than being duplicated
+                metadata = hit["_source"]
+                page_content = metadata.pop("content")
+                metadata["bm25_score"] = float(hit["_score"])
+                metadata["search_type"] = "elasticsearch_bm25"
+                metadata["elasticsearch_id"] = hit["_id"]
+                metadata["highlights"] = hit.get("highlight", {})
+                metadata["search_timestamp"] = search_timestamp
+                metadata["query"] = query
+                
+                # Create document with BM25 score
+                doc = Document(page_content=page_content, metadata=metadata)
+                documents.append(doc)
+                
+            except Exception as e:
+                logger.warning(f"Failed to parse Elasticsearch result {hit['_id']}: {e}")
+                continue
+        
+        return documents
+
     async def search(
         self,
         query: str,
@@ -384,69 +559,21 @@ class ElasticsearchRetriever:
         start_time = time.time()
         self.total_queries += 1
         
+        cache_key = (
+            query.strip(),
+            namespace,
+            repr(sorted(filters.items())) if filters else None,
+            top_k,
+        )
+        cached = self._search_cache_get(cache_key, start_time)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+        
         try:
             index_name = f"{self.index_prefix}-documents-{namespace}"
             
-            # Build Elasticsearch query
-            es_query = {
-                "query": {
-                    "bool": {
-                        "must": [
-                            {
-                                "multi_match": {
-                                    "query": query.strip(),
-                                    "fields": [
-                                        "content^1.0",
-                                        "title^2.0"
-                                    ],
-                                    "type": "best_fields",
-                                    "operator": "or",
-                                    "fuzziness": "AUTO",
-                                    "prefix_length": 2
-                                }
-                            }
-                        ],
-                        "filter": [
-                            {"term": {"namespace": namespace}}
-                        ]
-                    }
-                },
-                "highlight": {
-                    "fields": {
-                        "content": {
-                            "fragment_size": 150,
-                            "number_of_fragments": 3
-                        },
-                        "title": {}
-                    }
-                },
-                "size": top_k,
-                "_source": True
-            }
-            
-            # Add filters
-            if filters:
-                filter_clauses = es_query["query"]["bool"]["filter"]
-                
-                for key, value in filters.items():
-                    if key == "source":
-                        filter_clauses.append({"term": {"source": value}})
-                    elif key == "document_type":
-                        filter_clauses.append({"term": {"document_type": value}})
-                    elif key == "vin":
-                        filter_clauses.append({"term": {"vin": value}})
-                    elif key == "make":
-                        filter_clauses.append({"term": {"make": value}})
-                    elif key == "model":
-                        filter_clauses.append({"term": {"model": value}})
-                    elif key == "year_min":
-                        filter_clauses.append({"range": {"year": {"gte": value}}})
-                    elif key == "year_max":
-                        filter_clauses.append({"range": {"year": {"lte": value}}})
-                    elif key == "price_min":
-                        filter_clauses.append({"range": {"price": {"gte": value}}})
-                    elif key == "price_max":
-                        filter_clauses.append({"range": {"price": {"lte": value}}})
+            es_query = self._build_es_query(query, namespace, filters, top_k)
             
             # Execute search
             response = await self.es_client.search(
@@ -454,35 +581,17 @@ class ElasticsearchRetriever:
                 body=es_query
             )
             
-            # Parse results
-            documents = []
-            for hit in response["hits"]["hits"]:
-                try:
-                    source = hit["_source"]
-                    
-                    # Create document with BM25 score
-                    doc = Document(
-                        page_content=source["content"],
-                        metadata={
-                            **source,
-                            "bm25_score": float(hit["_score"]),
-                            "search_type": "elasticsearch_bm25",
-                            "elasticsearch_id": hit["_id"],
-                            "highlights": hit.get("highlight", {}),
-                            "search_timestamp": int(time.time()),
-                            "query": query.strip(),
-                        }
-                    )
-                    documents.append(doc)
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to parse Elasticsearch result {hit['_id']}: {e}")
-                    continue
+            documents = self._parse_hits(response["hits"]["hits"], query)
             
             query_time = time.time() - start_time
-            self.avg_query_time = (self.avg_query_time + query_time) / 2
+            # Exponentially weighted moving average, seeded by the first sample
+            if self.avg_query_time:
+                self.avg_query_time += QUERY_TIME_EWMA_ALPHA * (query_time - self.avg_query_time)
+            else:
+                self.avg_query_time = query_time
             
             logger.info(f"Elasticsearch search returned {len(documents)} results in {query_time:.3f}s")
+            self._search_cache_put(cache_key, documents, start_time)
             return documents
             
         except Exception as e:
@@ -490,6 +599,90 @@ class ElasticsearchRetriever:
             logger.error(f"Elasticsearch search failed: {e}")
             return []
 
+    def _search_cache_get(self, cache_key: tuple, now: float) -> Optional[List[Document]]:
+        """Return copies of unexpired cached results, or None on a miss."""
+        entry = self._search_cache.get(cache_key)
+        if entry is None:
+            return None
+        expires_at, documents = entry
+        if expires_at <= now:
+            del self._search_cache[cache_key]
+            return None
+        self._search_cache.move_to_end(cache_key)
+        # Callers annotate result metadata in place, so each hit gets its own Documents
+        return [
+            Document(page_content=doc.page_content, metadata=dict(doc.metadata))
+            for doc in documents
+        ]
+
+    def _search_cache_put(self, cache_key: tuple, documents: List[Document], now: float) -> None:
+        """Store a snapshot of search results, evicting least recently used entries."""
+        if self._search_cache_max <= 0:
+            return
+        snapshot = [
+            Document(page_content=doc.page_content, metadata=dict(doc.metadata))
+            for doc in documents
+        ]
+        self._search_cache[cache_key] = (now + self._search_cache_ttl, snapshot)
+        self._search_cache.move_to_end(cache_key)
+        while len(self._search_cache) > self._search_cache_max:
+            self._search_cache.popitem(last=False)
+
+    async def search_batch(
+        self,
+        queries: List[str],
+        namespace: str = "default",
+        filters: Optional[Dict[str, Any]] = None,
+        top_k: int = 20,
+    ) -> List[List[Document]]:
+        """
+        Perform several BM25 keyword searches in a single _msearch round trip.
+        
+        Args:
+            queries: Search queries
+            namespace: Namespace for multi-tenancy
+            filters: Additional filters applied to every query
+            top_k: Number of results to return per query
+            
+        Returns:
+            One result list per query, in order; blank or failed queries yield an empty list
+        """
+        results: List[List[Document]] = [[] for _ in queries]
+        live = [(i, query) for i, query in enumerate(queries) if query and query.strip()]
+        if not live:
+            return results
+
+        start_time = time.time()
+        self.total_queries += len(live)
+        
+        try:
+            index_name = f"{self.index_prefix}-documents-{namespace}"
+            
+            # NDJSON body of alternating header/search lines
+            searches = []
+            for _, query in live:
+                searches.append({"index": index_name})
+                searches.append(self._build_es_query(query, namespace, filters, top_k))
+            
+            response = await self.es_client.msearch(searches=searches)
+            
+            for (i, query), item in zip(live, response["responses"]):
+                if "error" in item:
+                    self.failed_queries += 1
+                    logger.warning(f"Elasticsearch msearch item {i} failed: {item['error']}")
+                    continue
+                results[i] = self._parse_hits(item["hits"]["hits"], query)
+            
+            logger.info(
+                f"Elasticsearch msearch ran {len(live)} queries in {time.time() - start_time:.3f}s"
+            )
+            
+        except Exception as e:
+            self.failed_queries += len(live)
+            logger.error(f"Elasticsearch msearch failed: {e}")
+        
+        return results
+
     async def health_check(self) -> Dict[str, Any]:
         """Perform comprehensive health check on Elasticsearch cluster."""
         health = {
@@ -556,6 +749,7 @@ class ElasticsearchRetriever:
             "total_index_operations": self.total_index_operations,
             "failed_index_operations": self.failed_index_operations,
             "avg_query_time_ms": self.avg_query_time * 1000,
+            "cache_hits": self.cache_hits,
             "success_rate": 1.0 - (self.failed_queries / max(1, self.total_queries)),
             "index_success_rate": 1.0 - (self.failed_index_operations / max(1, self.total_index_operations)),
         }
\ No newline at end of file
@@ -0,0 +1,16 @@
+"""
+Shared pytest configuration for the test suite.
+"""
+import asyncio
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on uvloop when it is installed (it ships with uvicorn[standard])."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
@@ -4,73 +4,85 @@ End-to-End Testing Suite for RAG System
 import asyncio
 import pytest
 import aiohttp
-from typing import Dict, List
+import orjson
+from dataclasses import dataclass
+from typing import Dict, List, Optional
 import json
+import traceback
+
+# Backoff between query attempts while a freshly ingested document is indexed
+# (~2s worst case); None marks the final attempt
+INDEXING_POLL_DELAYS = (0.05, 0.1, 0.2, 0.5, 1.0, None)
+
+# Fixed request bodies, serialized once and sent as-is
+_INGEST_DOC_BYTES = orjson.dumps({
+    "source_type": "text",
+    "content": "We have a 2023 Honda Accord EX available for $32,000. VIN: 1HGCV1F30NA123456. Features: Lane Assist, Apple CarPlay, Moonroof.",
+    "metadata": {"source": "test_inventory"}
+})
+_HONDA_QUERY_BYTES = orjson.dumps({
+    "query": "Do you have any Honda Accord models available?",
+    "top_k": 5
+})
+_INVENTORY_QUERY_BYTES = orjson.dumps({"query": "What cars do you have?"})
+_PERFORMANCE_QUERY_BYTES = orjson.dumps({"query": "What inventory do you have?"})
+_WARMUP_QUERY_BYTES = orjson.dumps({"query": "warmup", "top_k": 1})
+
+
+@dataclass(slots=True)
+class TestResult:
+    """Outcome of one E2E test."""
+    name: str
+    status: str
+    error: str = ""
+    traceback: str = ""
 
 
 class E2ETestSuite:
     def __init__(self, base_url: str, api_key: str):
         self.base_url = base_url
         self.headers = {"Authorization": f"Bearer {api_key}"}
-        self.test_results = []
+        self.test_results: List[TestResult] = []
+        # One pooled session shared by every test, opened in run_all_tests
+        self.session: Optional[aiohttp.ClientSession] = None
     
     async def test_full_rag_pipeline(self):
         """Test complete RAG pipeline: ingest -> query -> response"""
-        async with aiohttp.ClientSession() as session:
-            
-            # 1. Test document ingestion
-            test_doc = {
-                "source_type": "text",
-                "content": "We have a 2023 Honda Accord EX available for $32,000. VIN: 1HGCV1F30NA123456. Features: Lane Assist, Apple CarPlay, Moonroof.",
-                "metadata": {"source": "test_inventory"}
-            }
-            
-            async with session.post(
-                f"{self.base_url}/ingest",
-                json=test_doc,
-                headers=self.headers
-            ) as response:
-                assert response.status == 200
-                ingest_result = await response.json()
-                assert ingest_result["status"] == "success"
-            
-            # 2. Wait for indexing (in real system)
-            await asyncio.sleep(2)
-            
-            # 3. Test query retrieval
-            test_query = {
-                "query": "Do you have any Honda Accord models available?",
-                "top_k": 5
-            }
-            
-            async with session.post(
-                f"{self.base_url}/query",
-                json=test_query,
-                headers=self.headers
-            ) as response:
+        # 1. Test document ingestion
+        async with self.session.post(f"{self.base_url}/ingest", data=_INGEST_DOC_BYTES) as response:
+            assert response.status == 200
+            ingest_result = await response.json(loads=orjson.loads)
+            assert ingest_result["status"] == "success"
+        
+        # 2. Test query retrieval, retrying with backoff while the document is
+        # still being indexed (in real system) instead of a fixed 2s wait
+        for delay in INDEXING_POLL_DELAYS:
+            async with self.session.post(f"{self.base_url}/query", data=_HONDA_QUERY_BYTES) as response:
                 assert response.status == 200
-                query_result = await response.json()
-                assert "answer" in query_result
-                assert "honda" in query_result["answer"].lower()
-                assert len(query_result["sources"]) > 0
+                query_result = await response.json(loads=orjson.loads)
+            if query_result.get("sources") or delay is None:
+                break
+            await asyncio.sleep(delay)
+        
+        assert "answer" in query_result
+        assert "honda" in query_result["answer"].lower()
+        assert len(query_result["sources"]) > 0
     
     async def test_conversation_continuity(self):
         """Test multi-turn conversation handling"""
-        async with aiohttp.ClientSession() as session:
-            # First query
-            query1 = {"query": "What cars do you have?"}
-            async with session.post(f"{self.base_url}/query", json=query1, headers=self.headers) as response:
-                result1 = await response.json()
-                conversation_id = result1["conversation_id"]
-            
-            # Follow-up query with conversation context
-            query2 = {
-                "query": "What about the price for the Honda?",
-                "conversation_id": conversation_id
-            }
-            async with session.post(f"{self.base_url}/query", json=query2, headers=self.headers) as response:
-                result2 = await response.json()
-                assert result2["conversation_id"] == conversation_id
+        # First query
+        async with self.session.post(f"{self.base_url}/query", data=_INVENTORY_QUERY_BYTES) as response:
+            result1 = await response.json(loads=orjson.loads)
+            conversation_id = result1["conversation_id"]
+        
+        # Follow-up query with conversation context
+        query2 = {
+            "query": "What about the price for the Honda?",
+            "conversation_id": conversation_id
+        }
+        async with self.session.post(f"{self.base_url}/query", json=query2) as response:
+            result2 = await response.json(loads=orjson.loads)
+            assert result2["conversation_id"] == conversation_id
     
     async def test_dms_integration(self):
         """Test DMS adapter functionality"""
@@ -79,30 +91,28 @@ class E2ETestSuite:
     
     async def test_error_handling(self):
         """Test system behavior under error conditions"""
-        async with aiohttp.ClientSession() as session:
-            # Test malformed request
-            async with session.post(f"{self.base_url}/query", json={}, headers=self.headers) as response:
-                assert response.status == 422  # Validation error
-            
-            # Test authentication failure
-            bad_headers = {"Authorization": "Bearer invalid_key"}
-            async with session.post(f"{self.base_url}/query", json={"query": "test"}, headers=bad_headers) as response:
-                assert response.status == 401
+        # Test malformed request
+        async with self.session.post(f"{self.base_url}/query", json={}) as response:
+            assert response.status == 422  # Validation error
+        
+        # Test authentication failure (per-request headers override the session's)
+        bad_headers = {"Authorization": "Bearer invalid_key"}
+        async with self.session.post(f"{self.base_url}/query", json={"query": "test"}, headers=bad_headers) as response:
+            assert response.status == 401
     
     async def test_performance_requirements(self):
         """Test system meets performance SLAs"""
-        import time
-        async with aiohttp.ClientSession() as session:
-            start_time = time.time()
-            
-            async with session.post(
-                f"{self.base_url}/query",
-                json={"query": "What inventory do you have?"},
-                headers=self.headers
-            ) as response:
-                response_time = (time.time() - start_time) * 1000
-                assert response_time < 5000  # Under 5 seconds
-                assert response.status == 200
+        # Monotonic loop clock, so the SLA isn't skewed by wall-clock adjustments
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        
+        async with self.session.post(
+            f"{self.base_url}/query",
+            data=_PERFORMANCE_QUERY_BYTES
+        ) as response:
+            response_time = (loop.time() - start_time) * 1000
+            assert response_time < 5000  # Under 5 seconds
+            assert response.status == 200
     
     async def run_all_tests(self):
         """Run complete test suite"""
@@ -111,17 +121,61 @@ class E2ETestSuite:
             self.test_conversation_continuity,
             self.test_dms_integration,
             self.test_error_handling,
-            self.test_performance_requirements
         ]
         
-        for test in tests:
-            try:
-                await test()
-                self.test_results.append({"test": test.__name__, "status": "PASS"})
-            except Exception as e:
-                self.test_results.append({"test": test.__name__, "status": "FAIL", "error": str(e)})
+        # A single session keeps connections alive across tests instead of
+        # re-handshaking for every request
+        # Content-Type is a session default so pre-serialized bodies are sent as JSON
+        async with aiohttp.ClientSession(
+            headers={**self.headers, "Content-Type": "application/json"},
+            timeout=aiohttp.ClientTimeout(total=30),
+            # aiohttp already sets TCP_NODELAY on every connection it opens
+            connector=aiohttp.TCPConnector(
+                limit=32,
+                limit_per_host=32,
+                keepalive_timeout=75,
+                use_dns_cache=True,
+                ttl_dns_cache=300,
+            ),
+            json_serialize=lambda obj: orjson.dumps(obj).decode(),
+        ) as self.session:
+            await self._warm_up()
+            
+            # Functional tests are independent, so run them concurrently; ordering that
+            # matters (ingest before query) stays sequential inside each test. Each task
+            # records its own failure, so one failing test never cancels the group.
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(self._run_test(test)) for test in tests]
+            self.test_results.extend(task.result() for task in tasks)
+            
+            # The latency SLA is measured alone, once the backend is no longer
+            # serving the other tests
+            self.test_results.append(await self._run_test(self.test_performance_requirements))
         
         return self.test_results
+    
+    async def _warm_up(self):
+        """Send one throwaway query so SLA checks see steady-state latency, not cold start"""
+        try:
+            async with self.session.post(f"{self.base_url}/query", data=_WARMUP_QUERY_BYTES) as response:
+                await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            # An unreachable server surfaces in the tests themselves
+            pass
+    
+    async def _run_test(self, test) -> TestResult:
+        """Run one test and record its outcome"""
+        try:
+            await test()
+            return TestResult(name=test.__name__, status="PASS")
+        except Exception as e:
+            return TestResult(
+                name=test.__name__,
+                status="FAIL",
+                # Bare asserts have an empty message, so fall back to the exception type
+                error=str(e) or type(e).__name__,
+                traceback="".join(traceback.format_exception(e)),
+            )
 
 
 if __name__ == "__main__":
@@ -129,12 +183,20 @@ if __name__ == "__main__":
     base_url = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:8000"
     api_key = sys.argv[2] if len(sys.argv) > 2 else "dev-secret-change-in-production"
     
+    # uvloop ships with uvicorn[standard]; fall back to the default loop where unavailable
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     suite = E2ETestSuite(base_url, api_key)
     results = asyncio.run(suite.run_all_tests())
     
     print("🧪 E2E Test Results:")
     for result in results:
-        status_emoji = "✅" if result["status"] == "PASS" else "❌"
-        print(f"{status_emoji} {result['test']}: {result['status']}")
-        if result["status"] == "FAIL":
-            print(f"   Error: {result['error']}")
\ No newline at end of file
+        status_emoji = "✅" if result.status == "PASS" else "❌"
+        print(f"{status_emoji} {result.name}: {result.status}")
+        if result.status == "FAIL":
+            print(f"   Error: {result.error}")
+            print(result.traceback)
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+Tests for coalesced embed_single calls and cache payload decoding.
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src import embed
+from src.config import get_config
+from src.embed import (
+    EMBEDDING_CACHE_FORMAT_VERSION,
+    EmbeddingError,
+    VoyageEmbedder,
+    _decode_embedding,
+    _encode_embedding,
+)
+
+# A float32 header followed by a payload cut off mid-element
+CORRUPT_PAYLOAD = bytes((EMBEDDING_CACHE_FORMAT_VERSION, 1)) + b"\x00\x00\x80"
+
+
+@pytest.fixture
+def embedder(monkeypatch):
+    monkeypatch.setattr(get_config(), "voyage_api_key", "test-key")
+    voyage_embedder = VoyageEmbedder()
+    voyage_embedder.client = SimpleNamespace(
+        embed=AsyncMock(return_value=SimpleNamespace(embeddings=[[0.5, 0.25]]))
+    )
+    return voyage_embedder
+
+
+def test_decode_embedding_rejects_truncated_payload():
+    assert _decode_embedding(CORRUPT_PAYLOAD) is None
+    assert _decode_embedding(_encode_embedding([0.5, 0.25])) == [0.5, 0.25]
+
+
+@pytest.mark.asyncio
+async def test_corrupt_cache_entry_falls_back_to_api(embedder):
+    embedder.redis_client = SimpleNamespace(mget=AsyncMock(return_value=[CORRUPT_PAYLOAD]))
+
+    embedding = await asyncio.wait_for(embedder.embed_single("2024 Honda Accord"), timeout=1)
+
+    assert embedding == [0.5, 0.25]
+    embedder.client.embed.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_flush_failure_reaches_every_waiter(embedder, monkeypatch):
+    monkeypatch.setattr(
+        embedder, "_get_cached_embeddings_bulk", AsyncMock(side_effect=RuntimeError("boom"))
+    )
+
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            embedder.embed_single("2024 Honda Accord"),
+            embedder.embed_single("2023 Toyota Camry"),
+            return_exceptions=True,
+        ),
+        timeout=1,
+    )
+
+    assert all(isinstance(result, EmbeddingError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_idle_embed_single_skips_coalescing_window(embedder, monkeypatch):
+    monkeypatch.setattr(embed, "SINGLE_EMBED_COALESCE_WINDOW", 60)
+
+    embedding = await asyncio.wait_for(embedder.embed_single("2024 Honda Accord"), timeout=1)
+
+    assert embedding == [0.5, 0.25]
+
+
+@pytest.mark.asyncio
+async def test_redis_hit_skips_coalescing_window(embedder, monkeypatch):
+    monkeypatch.setattr(embed, "SINGLE_EMBED_COALESCE_WINDOW", 60)
+    # Another coalesced Voyage call is in flight, so misses would wait out the window
+    embedder._single_embeds_in_flight = 1
+    embedder.redis_client = SimpleNamespace(
+        mget=AsyncMock(return_value=[_encode_embedding([0.75, 0.5])])
+    )
+
+    embedding = await asyncio.wait_for(embedder.embed_single("2024 Honda Accord"), timeout=1)
+
+    assert embedding == [0.75, 0.5]
+    embedder.client.embed.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_local_cache_stores_packed_payloads(embedder):
+    first = await asyncio.wait_for(embedder.embed_single("2024 Honda Accord"), timeout=1)
+    second = await asyncio.wait_for(embedder.embed_single("2024 Honda Accord"), timeout=1)
+
+    assert first == second == [0.5, 0.25]
+    assert all(isinstance(payload, bytes) for payload in embedder._local_cache.values())
+    embedder.client.embed.assert_awaited_once()
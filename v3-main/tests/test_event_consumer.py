@@ -0,0 +1,112 @@
+"""
+Tests for EventConsumer offset batching across rebalances.
+"""
+from collections import OrderedDict
+
+import pytest
+from aiokafka.errors import CommitFailedError, IllegalStateError
+from aiokafka.structs import TopicPartition
+
+from src.events.kafka_producer import EventConsumer
+
+TP0 = TopicPartition("events", 0)
+TP1 = TopicPartition("events", 1)
+
+
+class FakeConsumer:
+    """Stands in for AIOKafkaConsumer: tracks the assignment and records commits."""
+
+    def __init__(self, assigned):
+        self.assigned = set(assigned)
+        self.commits = []
+        self.fail_with = None
+
+    def assignment(self):
+        return set(self.assigned)
+
+    async def commit(self, offsets):
+        if self.fail_with:
+            raise self.fail_with
+        if any(tp not in self.assigned for tp in offsets):
+            raise IllegalStateError("partition not assigned")
+        self.commits.append(dict(offsets))
+
+
+def _dispatch(consumer, topic_partition, *offsets):
+    """Register offsets as handed to processing tasks, like start_consuming does."""
+    pending = consumer._pending_offsets.setdefault(topic_partition, OrderedDict())
+    for offset in offsets:
+        pending[offset] = False
+
+
+@pytest.fixture
+def consumer():
+    event_consumer = EventConsumer("test-group", ["events"])
+    event_consumer.consumer = FakeConsumer({TP0, TP1})
+    return event_consumer
+
+
+@pytest.mark.asyncio
+async def test_revoke_mid_batch_commits_and_forgets_partition(consumer):
+    fake = consumer.consumer
+    _dispatch(consumer, TP0, 0, 1, 2)
+    _dispatch(consumer, TP1, 0, 1, 2)
+    consumer._mark_offset_done(TP0, 0)
+    consumer._mark_offset_done(TP1, 0)
+    consumer._mark_offset_done(TP1, 1)
+
+    # aiokafka calls the listener while the partition is still assigned
+    await consumer._on_partitions_revoked({TP1})
+    fake.assigned.discard(TP1)
+
+    assert fake.commits == [{TP1: 2}]
+    assert TP1 not in consumer._pending_offsets
+    assert TP1 not in consumer._commit_offsets
+
+    # A task for the revoked partition finishing late is ignored
+    consumer._mark_offset_done(TP1, 2)
+    consumer._mark_offset_done(TP0, 1)
+    await consumer._commit_ready_offsets()
+    assert fake.commits[-1] == {TP0: 2}
+
+    # Later batches keep committing
+    consumer._mark_offset_done(TP0, 2)
+    await consumer._commit_ready_offsets()
+    assert fake.commits[-1] == {TP0: 3}
+    assert consumer._commit_offsets == {}
+
+
+@pytest.mark.asyncio
+async def test_unassigned_offsets_are_not_committed_or_retried(consumer):
+    fake = consumer.consumer
+    _dispatch(consumer, TP0, 0)
+    _dispatch(consumer, TP1, 0)
+    consumer._mark_offset_done(TP0, 0)
+    consumer._mark_offset_done(TP1, 0)
+
+    # Partition lost without the listener having run
+    fake.assigned.discard(TP1)
+    await consumer._commit_ready_offsets()
+
+    assert fake.commits == [{TP0: 1}]
+    assert consumer._commit_offsets == {}
+
+
+@pytest.mark.asyncio
+async def test_commit_failures_requeue_only_when_retryable(consumer):
+    fake = consumer.consumer
+    _dispatch(consumer, TP0, 0, 1)
+    consumer._mark_offset_done(TP0, 0)
+
+    fake.fail_with = CommitFailedError("group rebalanced")
+    await consumer._commit_ready_offsets()
+    assert consumer._commit_offsets == {}
+
+    consumer._mark_offset_done(TP0, 1)
+    fake.fail_with = ConnectionError("broker unavailable")
+    await consumer._commit_ready_offsets()
+    assert consumer._commit_offsets == {TP0: 2}
+
+    fake.fail_with = None
+    await consumer._commit_ready_offsets()
+    assert fake.commits == [{TP0: 2}]
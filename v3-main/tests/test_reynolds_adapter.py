@@ -0,0 +1,45 @@
+"""
+Tests for parsing Reynolds inventory pages into Vehicle lists and columnar batches.
+"""
+import pytest
+
+from src.config import get_config
+from src.dms.reynolds_adapter import ReynoldsAdapter
+
+VALID_RECORD = {
+    "vin": "1HGCV1F34PA000001",
+    "make": "Honda",
+    "model": "Accord",
+    "model_year": 2024,
+    "type": "new",
+    "asking_price": 28500,
+    "odometer": 12,
+}
+
+
+@pytest.fixture
+def adapter(monkeypatch):
+    monkeypatch.setattr(get_config(), "reynolds_dealer_code", "D100")
+    return ReynoldsAdapter()
+
+
+def test_batch_drops_the_rows_the_list_path_skips(adapter):
+    items = [
+        VALID_RECORD,
+        {key: value for key, value in VALID_RECORD.items() if key != "make"},
+        {**VALID_RECORD, "status": "scrapped"},
+    ]
+
+    batch = adapter._build_vehicle_batch(items)
+
+    assert [vehicle.vin for vehicle in batch.to_vehicles()] == [VALID_RECORD["vin"]]
+    assert batch.vins == [vehicle.vin for vehicle in adapter._parse_inventory_page({"vehicles": items})]
+
+
+def test_batch_flags_malformed_vins(adapter):
+    legacy = {**VALID_RECORD, "vin": "FA123456"}
+
+    batch = adapter._build_vehicle_batch([VALID_RECORD, legacy])
+
+    assert batch.vin_valid.tolist() == [True, False]
+    assert [vehicle.vin_valid for vehicle in batch] == [True, False]